@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import datetime
+import threading
+from collections import OrderedDict
+
+# Seconds a successful /search/<endpoint> answer may be reused. Case status can
+# change during the day, so it is kept short. "eod" means until local
+# midnight: a day's cause list is valid for that day only.
+DEFAULT_TTLS = {
+    "cnr": 60,
+    "filing": 120,
+    "registration": 120,
+    "fir": 120,
+    "party": 300,
+    "subordinate": 300,
+    "advocate": 600,
+    "caveat": 600,
+    "pre_panel": 600,
+    "lokadalat": 1800,
+    "cause_list": "eod",
+}
+DEFAULT_TTL = 120
+# "No case found" answers are cached too, but only briefly
+NEGATIVE_TTL = 30
+
+
+def normalize_params(params) -> str:
+    """Canonical form of the request body: sorted keys, trimmed/collapsed/casefolded strings."""
+    def clean(value):
+        if isinstance(value, str):
+            return " ".join(value.split()).casefold()
+        if isinstance(value, dict):
+            return {str(k): clean(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [clean(v) for v in value]
+        return value
+    return json.dumps(clean(params or {}), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def cache_key(endpoint, params) -> str:
+    return f"{endpoint}|{normalize_params(params)}"
+
+
+def _seconds_until_midnight(now):
+    current = datetime.datetime.fromtimestamp(now)
+    midnight = datetime.datetime.combine(current.date() + datetime.timedelta(days=1), datetime.time())
+    return max(1.0, (midnight - current).total_seconds())
+
+
+def ttl_seconds(endpoint, has_data, now, ttls=None, default_ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL) -> float:
+    """How long an answer from `endpoint` stays fresh."""
+    ttl = (ttls if ttls is not None else DEFAULT_TTLS).get(endpoint, default_ttl)
+    ttl = _seconds_until_midnight(now) if ttl == "eod" else float(ttl)
+    if not has_data:
+        ttl = min(ttl, negative_ttl)
+    return ttl
+
+
+def parse_ttls(spec) -> dict:
+    """'cnr=30,cause_list=eod' -> {'cnr': 30.0, 'cause_list': 'eod'}"""
+    ttls = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        name, value = name.strip(), value.strip()
+        if not name or not value:
+            continue
+        try:
+            ttls[name] = value if value == "eod" else float(value)
+        except ValueError:
+            print(f"[WARN] Ignoring API cache TTL '{part}'.")
+    return ttls
+
+
+# ----------------- Response Cache -----------------
+class ResponseCache:
+    """
+    TTL cache in front of the backend, keyed by endpoint plus normalized params.
+
+    Only HTTP 200 answers are stored; errors always go back to the backend.
+    Single-flight of identical requests is done by the caller (AsyncAPIClient),
+    which reports each lookup's outcome through `record()`.
+    """
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, negative_ttl=NEGATIVE_TTL, max_entries=256):
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.per_endpoint = {}
+
+    def ttl_for(self, endpoint, response, now) -> float:
+        return ttl_seconds(endpoint, bool(response.get("data")), now, self.ttls, self.default_ttl, self.negative_ttl)
+
+    def _count(self, endpoint, outcome):
+        counts = self.per_endpoint.setdefault(endpoint, {"hit": 0, "miss": 0, "coalesced": 0})
+        counts[outcome] += 1
+
+    def record(self, endpoint, outcome):
+        """Count a lookup as "hit", "miss" or "coalesced" (joined a request already in flight)."""
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+            elif outcome == "miss":
+                self.misses += 1
+            else:
+                self.coalesced += 1
+            self._count(endpoint, outcome)
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[key]
+                self.expired += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, endpoint, response, now=None):
+        now = time.time() if now is None else now
+        if response.get("status") != 200:
+            return
+        ttl = self.ttl_for(endpoint, response, now)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (now + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "expired": self.expired,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "per_endpoint": self.per_endpoint,
+        }
+
+
+def response_cache_from_env():
+    """ResponseCache from API_CACHE_* settings, or None when API_CACHE=0."""
+    if os.getenv("API_CACHE", "1") == "0":
+        return None
+    return ResponseCache(
+        ttls=parse_ttls(os.getenv("API_CACHE_TTLS")),
+        max_entries=int(os.getenv("API_CACHE_MAX_ENTRIES", "256")),
+    )
@@ -0,0 +1,175 @@
+import os
+import time
+import random
+import threading
+from collections import deque
+
+# Gateway answers worth another attempt; anything else is the backend's real answer
+RETRY_STATUSES = {502, 503, 504}
+
+
+# ----------------- Retry Policy -----------------
+class RetryPolicy:
+    """
+    Jittered exponential backoff for idempotent searches. Every attempt of
+    one search shares `budget` seconds, so a visitor never waits longer than
+    that for "Kindly check the connection", however many attempts are left.
+    """
+
+    def __init__(self, attempts=3, base_delay=0.25, max_delay=2.0, budget=8.0, min_attempt_seconds=0.5):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.min_attempt_seconds = min_attempt_seconds
+
+    def delay(self, attempt) -> float:
+        """Pause after failed attempt number `attempt` (1-based), with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def should_retry(self, attempt, remaining, delay) -> bool:
+        return attempt < self.attempts and remaining - delay >= self.min_attempt_seconds
+
+
+# ----------------- Circuit Breaker -----------------
+class CircuitBreaker:
+    """
+    Fails searches fast while the backend is down.
+
+    closed     requests go through; `failure_threshold` consecutive failed
+               searches open the circuit
+    open       requests fail at once; after `reset_seconds` the next request
+               becomes a probe
+    half_open  one caller probes /health; success closes the circuit,
+               failure re-opens it with the wait doubled (up to
+               `max_reset_seconds`). A probe that never reports back
+               (cancelled, lost) is replaced after `probe_timeout` seconds.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=2, reset_seconds=15.0, max_reset_seconds=120.0, probe_timeout=10.0,
+                 on_transition=None):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.probe_timeout = probe_timeout
+        self.on_transition = on_transition
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._wait = reset_seconds
+        self._lock = threading.Lock()
+
+        self.transitions = deque(maxlen=50)  # (timestamp, old, new, reason)
+        self.fast_failures = 0
+        self.probes = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _move(self, new, reason):
+        old, self._state = self._state, new
+        if old == new:
+            return
+        stamp = time.time()
+        self.transitions.append((stamp, old, new, reason))
+        print(f"[{'INFO' if new == self.CLOSED else 'WARN'}] Backend circuit {old} -> {new} ({reason})")
+        if self.on_transition is not None:
+            try:
+                self.on_transition(old, new, reason)
+            except Exception as e:
+                print(f"[WARN] Circuit transition callback failed: {e}")
+
+    def before_request(self, now=None) -> str:
+        """
+        "allow" to send the request, "probe" when this caller must check
+        /health first (and report it via `probe_result`), "reject" to fail fast.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._state == self.CLOSED:
+                return "allow"
+            if self._state == self.OPEN and now - self._opened_at >= self._wait:
+                self._move(self.HALF_OPEN, f"probing after {self._wait:.0f}s")
+                self._probe_started = now
+                self.probes += 1
+                return "probe"
+            if self._state == self.HALF_OPEN and now - self._probe_started >= self.probe_timeout:
+                # the probe never reported back; let this caller probe instead
+                print(f"[WARN] Backend health probe lost after {self.probe_timeout:.0f}s; probing again.")
+                self._probe_started = now
+                self.probes += 1
+                return "probe"
+            self.fast_failures += 1
+            return "reject"
+
+    def probe_result(self, healthy, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            if healthy:
+                self._failures = 0
+                self._wait = self.reset_seconds
+                self._move(self.CLOSED, "health probe succeeded")
+            else:
+                self._wait = min(self.max_reset_seconds, self._wait * 2)
+                self._opened_at = now
+                self._move(self.OPEN, f"health probe failed, next probe in {self._wait:.0f}s")
+
+    def probe_abandoned(self, now=None):
+        """The probe was cancelled before it finished: back to OPEN, with the next request probing again."""
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._opened_at = now - self._wait
+                self._move(self.OPEN, "health probe cancelled")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._wait = self.reset_seconds
+                self._move(self.CLOSED, "search succeeded")
+
+    def record_failure(self, reason="search failed", now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._opened_at = now
+                self._move(self.OPEN, f"{self._failures} consecutive failure(s): {reason}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "fast_failures": self.fast_failures,
+                "probes": self.probes,
+                "transitions": [(round(stamp, 1), old, new) for stamp, old, new, _ in self.transitions],
+            }
+
+
+def retry_policy_from_env():
+    return RetryPolicy(
+        attempts=int(os.getenv("API_RETRY_ATTEMPTS", "3")),
+        base_delay=float(os.getenv("API_RETRY_BASE_DELAY", "0.25")),
+        budget=float(os.getenv("API_RETRY_BUDGET", "8")),
+    )
+
+
+def circuit_breaker_from_env():
+    """CircuitBreaker from CIRCUIT_* settings, or None when CIRCUIT_BREAKER=0."""
+    if os.getenv("CIRCUIT_BREAKER", "1") == "0":
+        return None
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv("CIRCUIT_FAILURES", "2")),
+        reset_seconds=float(os.getenv("CIRCUIT_RESET_SECONDS", "15")),
+        max_reset_seconds=float(os.getenv("CIRCUIT_MAX_RESET_SECONDS", "120")),
+        probe_timeout=float(os.getenv("CIRCUIT_PROBE_TIMEOUT", "10")),
+    )
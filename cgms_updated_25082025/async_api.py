@@ -0,0 +1,303 @@
+import asyncio
+import threading
+import concurrent.futures
+
+from api_cache import cache_key
+from api_resilience import RetryPolicy, RETRY_STATUSES
+
+JSON_HEADERS = {"accept": "application/json", "Content-Type": "application/json"}
+# X-Cache states of the kiosk cache proxy (cache_proxy.py) that were answered
+# without the upstream, so they say nothing about whether it is up
+PROXY_SERVED = {"HIT", "STALE", "STALE-ERROR"}
+
+
+# ----------------- Async API Client -----------------
+class AsyncAPIClient:
+    """
+    Backend calls on a private asyncio loop in a daemon thread, so a slow
+    backend never blocks the Tk main thread. `submit()` returns a
+    `concurrent.futures.Future` resolving to the same dicts `APIClient.post`
+    returns ({"status": 200, "data": ...} or {"status": "error", ...}).
+
+    Identical requests in flight share one call; the shared call is only
+    abandoned once every caller has given up, or by `cancel_all()`. When
+    httpx is unavailable, requests run on a thread pool with `requests`.
+
+    Failed attempts are retried under `retry`'s time budget. With a
+    `breaker`, searches fail at once while the backend is known to be down,
+    and /health is probed before traffic resumes. Only searches a visitor is
+    waiting for count towards the breaker: speculative ones (prefetch) and
+    answers the cache proxy served from its own store are left out.
+    """
+
+    def __init__(self, base_url, cache=None, connect_timeout=3.0, read_timeout=10.0, retry=None, breaker=None,
+                 health_url=None):
+        self.base_url = base_url.rstrip("/")
+        self.health_url = health_url or self.base_url.rsplit("/", 1)[0] + "/health"
+        self.cache = cache
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry = retry or RetryPolicy(attempts=1, budget=connect_timeout + read_timeout)
+        self.breaker = breaker
+        self.retries = 0
+
+        self._pending = set()
+        self._inflight = {}
+        self._waiters = {}
+        self._wanted = set()  # keys in flight that a non-speculative caller waits on
+        self._lock = threading.Lock()
+        self._client = None
+        self._httpx = None
+        self._session = None
+        self._executor = None
+        self._closed = False
+        self.completed = 0
+        self.cancelled = 0
+
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="api-loop", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            import httpx
+            self._httpx = httpx
+            self._client = httpx.AsyncClient(
+                headers=JSON_HEADERS,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            )
+        except Exception as e:
+            import requests
+            print(f"[WARN] httpx unavailable ({e}); backend calls will use requests on worker threads.")
+            self._session = requests.Session()
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-call")
+        self._ready.set()
+        self._loop.run_forever()
+
+    # ================================== Requests =======================================
+    async def _send(self, method, url, params, read_timeout):
+        connect = min(self.connect_timeout, read_timeout)
+        if self._client is not None:
+            timeout = self._httpx.Timeout(read_timeout, connect=connect)
+            if method == "GET":
+                return await self._client.get(url, timeout=timeout)
+            return await self._client.post(url, json=params, timeout=timeout)
+        send = self._session.get if method == "GET" else self._session.post
+        return await self._loop.run_in_executor(
+            self._executor,
+            lambda: send(url, headers=JSON_HEADERS, json=params, timeout=(connect, read_timeout)),
+        )
+
+    async def _attempt(self, url, params, read_timeout):
+        """One POST. Returns (result, retryable)."""
+        try:
+            response = await self._send("POST", url, params, read_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # connect/read timeouts and refused connections
+            return {"status": "error", "error": str(e) or type(e).__name__}, True
+        proxy_state = response.headers.get("X-Cache")
+        if response.status_code in RETRY_STATUSES:
+            result = {"status": response.status_code, "error": f"backend returned {response.status_code}"}
+            retryable = True
+        else:
+            try:
+                result, retryable = {"status": response.status_code, "data": response.json()}, False
+            except Exception as e:
+                result, retryable = {"status": "error", "error": f"invalid response: {e}"}, False
+        if proxy_state:
+            result["proxy"] = proxy_state
+        return result, retryable
+
+    async def _probe(self) -> bool:
+        """True when /health answers 200, or the cache proxy reports degraded but is still serving."""
+        try:
+            response = await self._send("GET", self.health_url, None, min(2.0, self.read_timeout))
+            if response.status_code == 200:
+                return True
+            try:
+                return response.json().get("status") == "degraded"
+            except Exception:
+                return False
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return False
+
+    def _record(self, key, result, retryable):
+        """Feed the breaker with the outcome of a search, unless it says nothing about the upstream."""
+        if key not in self._wanted or result.get("proxy") in PROXY_SERVED:
+            return
+        status = result.get("status")
+        if retryable or (isinstance(status, int) and status >= 500):
+            self.breaker.record_failure(result.get("error") or f"status {status}")
+        else:
+            self.breaker.record_success()
+
+    async def _post(self, endpoint, params, key):
+        if self.breaker is not None:
+            gate = self.breaker.before_request()
+            if gate == "probe":
+                healthy = None
+                try:
+                    healthy = await self._probe()
+                finally:
+                    # a cancelled probe must not leave the breaker half-open
+                    if healthy is None:
+                        self.breaker.probe_abandoned()
+                    else:
+                        self.breaker.probe_result(healthy)
+                gate = "allow" if healthy else "reject"
+            if gate == "reject":
+                return {"status": "error", "error": "backend unavailable (circuit open)", "circuit": "open"}
+
+        url = f"{self.base_url}/{endpoint}"
+        deadline = self._loop.time() + self.retry.budget
+        attempt = 0
+        while True:
+            attempt += 1
+            remaining = deadline - self._loop.time()
+            result, retryable = await self._attempt(url, params, max(0.1, min(self.read_timeout, remaining)))
+            if not retryable:
+                break
+            delay = self.retry.delay(attempt)
+            if not self.retry.should_retry(attempt, deadline - self._loop.time(), delay):
+                break
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+        if self.breaker is not None:
+            self._record(key, result, retryable)
+        if attempt > 1:
+            result["attempts"] = attempt
+        return result
+
+    def _landed(self, key):
+        self._inflight.pop(key, None)
+        self._wanted.discard(key)
+
+    async def _request(self, endpoint, params, speculative=False):
+        key = cache_key(endpoint, params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.record(endpoint, "hit")
+                return dict(cached, cache="hit")
+
+        task = self._inflight.get(key)
+        outcome = "coalesced"
+        if task is None:
+            outcome = "miss"
+            task = self._inflight[key] = self._loop.create_task(self._post(endpoint, params, key))
+            task.add_done_callback(lambda _t: self._landed(key))
+        if self.cache is not None:
+            self.cache.record(endpoint, outcome)
+        # a visitor joining a speculation makes its outcome count after all
+        if not speculative:
+            self._wanted.add(key)
+
+        # shield: one caller giving up must not cancel the call for the others,
+        # but the last one leaving aborts it (e.g. an unused prefetch)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters.get(key) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+        if outcome == "miss" and self.cache is not None:
+            self.cache.put(key, endpoint, result)
+        return dict(result, cache=outcome)
+
+    def submit(self, endpoint: str, params: dict, speculative=False) -> concurrent.futures.Future:
+        """
+        Start a POST to /<endpoint> and return its future right away.
+        Speculative requests never open or close the circuit.
+        """
+        if self._closed:
+            future = concurrent.futures.Future()
+            future.set_result({"status": "error", "error": "API client is closed"})
+            return future
+        future = asyncio.run_coroutine_threadsafe(self._request(endpoint, params, speculative), self._loop)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._finished)
+        return future
+
+    def post(self, endpoint: str, params: dict, timeout=None):
+        """Blocking form of `submit()` for callers off the UI thread."""
+        try:
+            return self.submit(endpoint, params).result(timeout)
+        except concurrent.futures.CancelledError:
+            return {"status": "cancelled", "error": "request cancelled"}
+        except concurrent.futures.TimeoutError:
+            return {"status": "error", "error": "request timed out"}
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending.discard(future)
+            if future.cancelled():
+                self.cancelled += 1
+            else:
+                self.completed += 1
+
+    # ================================== Cancellation ===================================
+    def cancel_all(self) -> int:
+        """Cancel every pending request, including shared in-flight calls. Returns how many were cancelled."""
+        with self._lock:
+            pending = list(self._pending)
+        count = sum(1 for future in pending if future.cancel())
+
+        def cancel_inflight():
+            for task in list(self._inflight.values()):
+                task.cancel()
+
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(cancel_inflight)
+        return count
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def stats(self) -> dict:
+        stats = {"pending": self.pending(), "completed": self.completed, "cancelled": self.cancelled,
+                 "retries": self.retries, "transport": "httpx" if self._client is not None else "requests"}
+        if self.breaker is not None:
+            stats["circuit"] = self.breaker.stats()
+        return stats
+
+    def backend_available(self) -> bool:
+        """False while the circuit is open, i.e. searches would fail at once."""
+        return self.breaker is None or self.breaker.state != self.breaker.OPEN
+
+    def close(self):
+        """Cancel outstanding work and stop the loop thread. Safe to call more than once."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.cancel_all()
+
+        async def shutdown():
+            if self._client is not None:
+                await self._client.aclose()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=2)
+        except Exception:
+            pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+        if not self._thread.is_alive():
+            self._loop.close()
@@ -0,0 +1,221 @@
+import time
+import threading
+from collections import deque
+
+import numpy as np
+import speech_recognition as sr
+
+
+# ----------------- Microphone Service -----------------
+class MicrophoneService:
+    """
+    Keeps one microphone stream open for the life of the kiosk and records it
+    continuously into a fixed-size ring buffer.
+
+    Every chunk gets an RMS energy. The noise floor is a low percentile of the
+    energies heard over the last `noise_window` seconds while the kiosk was
+    quiet, so it follows ambient noise up (a fan, a crowd) as well as down,
+    and short bursts of speech do not move it. `listen()`
+    cuts an utterance out of the buffer with energy-based voice activity
+    detection, starting `pre_roll` seconds before the detected onset, so a
+    litigant who answers the moment the prompt ends is not clipped.
+    """
+
+    def __init__(self, device_index=None, buffer_seconds=30.0, pre_roll=0.4, pause_threshold=0.8,
+                 min_speech=0.15, energy_ratio=1.6, min_energy=120.0, quiet_check=None,
+                 noise_window=10.0, noise_percentile=20, max_phrase_seconds=15.0):
+        self.device_index = device_index
+        self.buffer_seconds = buffer_seconds
+        self.pre_roll = pre_roll
+        self.pause_threshold = pause_threshold
+        self.min_speech = min_speech
+        self.energy_ratio = energy_ratio
+        self.min_energy = min_energy
+        self.noise_window = noise_window
+        self.noise_percentile = noise_percentile
+        # longest utterance listen() returns when the caller gives no phrase_time_limit
+        self.max_phrase_seconds = max_phrase_seconds
+        # callable returning False while the kiosk itself is talking
+        self.quiet_check = quiet_check or (lambda: True)
+
+        self._microphone = None
+        self._source = None
+        self._ring = deque()
+        self._quiet_energies = deque()
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._seq = 0
+        self._last_busy = 0.0
+
+        self.sample_rate = None
+        self.sample_width = None
+        self.chunk_seconds = None
+        self.noise_floor = None
+
+        self.turns = 0
+        self.overflows = 0
+        self.discarded_blips = 0
+
+    # ================================== Lifecycle ======================================
+    def start(self):
+        """Open the device and start the capture thread."""
+        self._microphone = sr.Microphone(device_index=self.device_index)
+        self._source = self._microphone.__enter__()
+        self.sample_rate = self._source.SAMPLE_RATE
+        self.sample_width = self._source.SAMPLE_WIDTH
+        self.chunk_seconds = self._source.CHUNK / float(self.sample_rate)
+        self._ring = deque(maxlen=max(1, int(self.buffer_seconds / self.chunk_seconds)))
+        self._quiet_energies = deque(maxlen=max(1, int(self.noise_window / self.chunk_seconds)))
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="mic-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        if self._microphone is not None:
+            try:
+                self._microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+        self._microphone = None
+        self._source = None
+        with self._cond:
+            self._cond.notify_all()
+
+    @property
+    def running(self) -> bool:
+        return self._source is not None and not self._stopped.is_set()
+
+    # ================================== Capture thread =================================
+    def _run(self):
+        chunk = self._source.CHUNK
+        stream = self._source.stream
+        while not self._stopped.is_set():
+            try:
+                data = stream.read(chunk)
+            except Exception as e:
+                self.overflows += 1
+                if self._stopped.is_set():
+                    break
+                print(f"[WARN] Microphone read failed: {e}")
+                time.sleep(0.05)
+                continue
+
+            now = time.time()
+            energy = self._energy(data)
+            quiet = self.quiet_check()
+            if not quiet:
+                self._last_busy = now
+
+            floor = None
+            if quiet:
+                # only while the kiosk is silent; a low percentile ignores speech but tracks rising ambient noise
+                self._quiet_energies.append(energy)
+                if self.noise_floor is None or self._seq % 8 == 0:
+                    floor = float(np.percentile(self._quiet_energies, self.noise_percentile))
+
+            with self._cond:
+                if floor is not None:
+                    self.noise_floor = floor
+                self._seq += 1
+                self._ring.append((self._seq, now, energy, data))
+                self._cond.notify_all()
+
+    @staticmethod
+    def _energy(data) -> float:
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(samples * samples)))
+
+    @property
+    def threshold(self) -> float:
+        floor = self.noise_floor if self.noise_floor is not None else self.min_energy
+        return max(self.min_energy, floor * self.energy_ratio)
+
+    # ================================== Utterances =====================================
+    def _chunks_after(self, seq):
+        return [item for item in self._ring if item[0] > seq]
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        """
+        Return the next utterance as sr.AudioData. Raises sr.WaitTimeoutError when
+        no speech starts within `timeout` seconds. Utterances are cut at
+        `phrase_time_limit` (default `max_phrase_seconds`) even without a pause.
+        """
+        phrase_time_limit = phrase_time_limit or self.max_phrase_seconds
+        if not self.running:
+            raise sr.WaitTimeoutError("microphone service is not running")
+
+        self.turns += 1
+        started = time.time()
+        # Audio from before the kiosk stopped talking is never part of the answer
+        earliest = max(started - self.pre_roll, self._last_busy + 0.15)
+
+        with self._cond:
+            cursor = self._ring[-1][0] if self._ring else 0
+            pre_roll = [item for item in self._ring if item[1] >= earliest]
+
+        onset = None
+        voiced = 0.0
+        silence = 0.0
+        collected = list(pre_roll)
+        # Start scanning from the pre-roll so speech that began just before listen() counts
+        pending = list(pre_roll)
+
+        while True:
+            for seq, stamp, energy, _ in pending:
+                cursor = max(cursor, seq)
+                is_speech = energy > self.threshold
+                if onset is None:
+                    if is_speech:
+                        onset = stamp
+                        voiced = self.chunk_seconds
+                        silence = 0.0
+                    continue
+
+                if is_speech:
+                    voiced += self.chunk_seconds
+                    silence = 0.0
+                else:
+                    silence += self.chunk_seconds
+
+                if silence >= self.pause_threshold:
+                    if voiced >= self.min_speech:
+                        return self._cut(collected, onset, stamp)
+                    # a click or cough, not an answer: keep waiting
+                    self.discarded_blips += 1
+                    onset = None
+                    voiced = silence = 0.0
+
+                if phrase_time_limit and stamp - onset >= phrase_time_limit:
+                    return self._cut(collected, onset, stamp)
+
+            if onset is None and timeout is not None and time.time() - started > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if not self.running:
+                raise sr.WaitTimeoutError("microphone service stopped")
+
+            with self._cond:
+                self._cond.wait(timeout=0.1)
+                pending = self._chunks_after(cursor)
+            collected.extend(pending)
+
+    def _cut(self, collected, onset, end):
+        """Join chunks from `pre_roll` before the onset up to the endpoint."""
+        start = onset - self.pre_roll
+        frames = b"".join(data for _, stamp, _, data in collected if start <= stamp <= end)
+        return sr.AudioData(frames, self.sample_rate, self.sample_width)
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turns,
+            "noise_floor": round(self.noise_floor, 1) if self.noise_floor is not None else None,
+            "threshold": round(self.threshold, 1),
+            "buffered_seconds": round(len(self._ring) * (self.chunk_seconds or 0), 2),
+            "discarded_blips": self.discarded_blips,
+            "read_errors": self.overflows,
+        }
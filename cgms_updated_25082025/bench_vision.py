@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import argparse
+
+from frame_sources import create_frame_source, SyntheticSource
+from face_detectors import create_face_detector
+from presence import presence_tracker_from_env
+from vision import ZoneWatcher
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+# ----------------- Benchmark -----------------
+def run_benchmark(source, detector, max_frames=None, max_seconds=None, conversation_seconds=0.0):
+    """
+    Drive the kiosk's detection stage (motion gate, detector/tracker, presence)
+    from `source` without Tk, a camera or audio. Returns throughput, detection
+    latency percentiles and the media timestamps of every session_start.
+    """
+    watcher = ZoneWatcher(detector.detect)
+    presence = presence_tracker_from_env()
+    latencies = []
+    triggers = []
+    held_until = None
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    while True:
+        if max_frames is not None and len(latencies) >= max_frames:
+            break
+        if max_seconds is not None and time.perf_counter() - started >= max_seconds:
+            break
+        ret, frame = source.read()
+        if not ret:
+            break
+        stamp = source.position
+
+        t0 = time.perf_counter()
+        faces = watcher.faces(frame)
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+
+        # A conversation holds presence the same way camera_pause does in the kiosk
+        if held_until is not None and stamp >= held_until:
+            held_until = None
+        presence.set_held(held_until is not None, now=stamp)
+        for name, when in presence.update(bool(faces), now=stamp):
+            if name == "session_start":
+                triggers.append(round(when, 2))
+                if conversation_seconds:
+                    held_until = when + conversation_seconds
+
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    ordered = sorted(latencies)
+    return {
+        "source": source.name,
+        "detector": detector.name,
+        "frames": len(latencies),
+        "skipped_by_source": getattr(source, "frames_skipped", 0),
+        "wall_seconds": round(wall, 2),
+        "fps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "cpu_percent": round(100.0 * cpu / wall, 1) if wall else 0.0,
+        "detect_ms": {
+            "p50": round(_percentile(ordered, 0.50), 2),
+            "p90": round(_percentile(ordered, 0.90), 2),
+            "p99": round(_percentile(ordered, 0.99), 2),
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+        },
+        "triggers": triggers,
+        **watcher.stats(),
+        "presence": presence.stats(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the face-detection loop on replayed or synthetic frames.")
+    parser.add_argument("--source", default="synthetic:640x480@15",
+                        help="device:N | video:<file> | images:<dir>[@fps] | synthetic[:WxH[@fps]]")
+    parser.add_argument("--detector", default=os.getenv("FACE_DETECTOR", "haar"))
+    parser.add_argument("--realtime", action="store_true", help="pace replay at the recording's frame rate")
+    parser.add_argument("--loop", action="store_true")
+    parser.add_argument("--frames", type=int, default=None, help="stop after N frames")
+    parser.add_argument("--seconds", type=float, default=None, help="stop after N wall-clock seconds")
+    parser.add_argument("--conversation-seconds", type=float, default=20.0,
+                        help="hold presence this long after each trigger, like a conversation")
+    parser.add_argument("--face-image", default=None, help="synthetic source: paste this face during visits")
+    args = parser.parse_args(argv)
+
+    if args.source.startswith("synthetic") and args.face_image:
+        size, _, fps = args.source.partition(":")[2].partition("@")
+        width, _, height = (size or "640x480").partition("x")
+        source = SyntheticSource(int(width), int(height), fps=float(fps or 15), realtime=args.realtime,
+                                 face_image=args.face_image)
+    else:
+        source = create_frame_source(args.source, realtime=args.realtime, loop=args.loop)
+    if args.frames is None and args.seconds is None and getattr(source, "length", None) is None:
+        # endless sources (devices, synthetic) need a bound
+        args.frames = 900
+
+    detector = create_face_detector(args.detector)
+    try:
+        result = run_benchmark(source, detector, args.frames, args.seconds, args.conversation_seconds)
+    finally:
+        source.release()
+
+    for key, value in result.items():
+        print(f"[INFO] {key}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from flask import Flask, Response, request
+
+from api_cache import DEFAULT_TTLS, cache_key, parse_ttls, ttl_seconds
+
+# Case details change about as often as case status
+CASES_TTL = 300
+# How long past its TTL an answer may still be served while it is refreshed
+STALE_SECONDS = 600
+# How long past its TTL an answer may be served when the backend is down
+STALE_IF_ERROR_SECONDS = 6 * 3600
+
+
+class _Entry:
+    __slots__ = ("status", "body", "stored_at", "fresh_until", "stale_until")
+
+    def __init__(self, status, body, stored_at, fresh_until, stale_until):
+        self.status = status
+        self.body = body
+        self.stored_at = stored_at
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+# ----------------- Disk Tier -----------------
+class DiskTier:
+    """SQLite store of upstream answers; survives proxy restarts and is shared by its threads."""
+
+    def __init__(self, path, max_rows=20000):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes = 0
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            print(f"[WARN] Proxy disk cache at {path} unavailable ({e}). Using memory only.")
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key          TEXT PRIMARY KEY,
+                status       INTEGER NOT NULL,
+                body         BLOB NOT NULL,
+                stored_at    REAL NOT NULL,
+                fresh_until  REAL NOT NULL,
+                stale_until  REAL NOT NULL
+            )
+            """
+        )
+        self.prune()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, body, stored_at, fresh_until, stale_until FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return _Entry(*row) if row else None
+
+    def put(self, key, entry):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.status, entry.body, entry.stored_at, entry.fresh_until, entry.stale_until),
+            )
+            self._writes += 1
+            due = self._writes % 200 == 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Drop answers too old to serve even when the backend is down, then cap the row count."""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM responses WHERE stale_until < ?", (time.time() - STALE_IF_ERROR_SECONDS,))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                )
+            except Exception as e:
+                print(f"[WARN] Proxy disk cache prune failed: {e}")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ----------------- Cache Proxy -----------------
+class CacheProxy:
+    """
+    Caching front for the case-search backend, shared by every kiosk in a
+    court complex. Lookups go memory (LRU), then disk, then upstream.
+    Concurrent identical misses from any kiosk share one upstream call.
+
+    An answer past its TTL but within `stale_seconds` is served immediately
+    and refreshed in the background (stale-while-revalidate). While the
+    backend is down, answers up to `stale_if_error_seconds` old are still
+    served. Backend load therefore follows the number of unique queries, not
+    the number of kiosks.
+    """
+
+    def __init__(self, upstream, db_path, memory_entries=1024, ttls=None, stale_seconds=STALE_SECONDS,
+                 stale_if_error_seconds=STALE_IF_ERROR_SECONDS, timeout=10.0):
+        self.upstream = upstream.rstrip("/")
+        self.memory_entries = memory_entries
+        self.ttls = dict(DEFAULT_TTLS, cases=CASES_TTL)
+        self.ttls.update(ttls or {})
+        self.stale_seconds = stale_seconds
+        self.stale_if_error_seconds = stale_if_error_seconds
+        self.timeout = timeout
+
+        self.disk = DiskTier(db_path)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._refreshing = set()
+        self._local = threading.local()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="proxy-refresh")
+
+        self.counts = {key: 0 for key in (
+            "memory_hits", "disk_hits", "stale_served", "stale_on_error", "misses",
+            "coalesced", "upstream_calls", "upstream_errors", "revalidations",
+        )}
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    # ================================== Tiers ==========================================
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+        entry = self.disk.get(key)
+        if entry is not None:
+            self._remember(key, entry)
+            return entry, "disk"
+        return None, None
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, key, endpoint, status, body):
+        now = time.time()
+        try:
+            has_data = bool(json.loads(body))
+        except Exception:
+            has_data = True
+        ttl = ttl_seconds(endpoint, has_data, now, self.ttls)
+        # A day's cause list must not be served after midnight, not even while refreshing
+        stale = 0 if self.ttls.get(endpoint) == "eod" else self.stale_seconds
+        entry = _Entry(status, body, now, now + ttl, now + ttl + stale)
+        self._remember(key, entry)
+        self.disk.put(key, entry)
+        return entry
+
+    # ================================== Upstream =======================================
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _call_upstream(self, method, path, payload=None):
+        self._count("upstream_calls")
+        url = f"{self.upstream}{path}"
+        if method == "POST":
+            response = self._session().post(url, json=payload, timeout=self.timeout,
+                                            headers={"accept": "application/json", "Content-Type": "application/json"})
+        else:
+            response = self._session().get(url, timeout=self.timeout, headers={"accept": "application/json"})
+        return response.status_code, response.content
+
+    def _fetch(self, key, endpoint, method, path, payload):
+        """Single-flight upstream fetch; stores 200 answers. Returns (status, body) or raises."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = {"done": threading.Event(), "result": None, "error": None}
+        if not leader:
+            self._count("coalesced")
+            flight["done"].wait(self.timeout + 5)
+            if flight["error"] is not None or flight["result"] is None:
+                raise RuntimeError(flight["error"] or "upstream request timed out")
+            return flight["result"]
+
+        try:
+            status, body = self._call_upstream(method, path, payload)
+            if status == 200:
+                self._store(key, endpoint, status, body)
+            flight["result"] = (status, body)
+            return status, body
+        except Exception as e:
+            self._count("upstream_errors")
+            flight["error"] = str(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight["done"].set()
+
+    def _revalidate(self, key, endpoint, method, path, payload):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch(key, endpoint, method, path, payload)
+                self._count("revalidations")
+            except Exception as e:
+                print(f"[WARN] Background refresh of {path} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(refresh)
+
+    # ================================== Lookup =========================================
+    def lookup(self, key, endpoint, method, path, payload=None):
+        """Returns (status, body, cache_state) for the kiosk."""
+        now = time.time()
+        entry, tier = self._lookup(key)
+        if entry is not None and now < entry.fresh_until:
+            self._count("memory_hits" if tier == "memory" else "disk_hits")
+            return entry.status, entry.body, "HIT"
+        if entry is not None and now < entry.stale_until:
+            self._count("stale_served")
+            self._revalidate(key, endpoint, method, path, payload)
+            return entry.status, entry.body, "STALE"
+
+        self._count("misses")
+        try:
+            status, body = self._fetch(key, endpoint, method, path, payload)
+            return status, body, "MISS"
+        except Exception as e:
+            if entry is not None and now < entry.fresh_until + self.stale_if_error_seconds \
+                    and self.ttls.get(endpoint) != "eod":
+                self._count("stale_on_error")
+                print(f"[WARN] Backend unavailable ({e}); serving stale {path}.")
+                return entry.status, entry.body, "STALE-ERROR"
+            body = json.dumps({"detail": f"backend unavailable: {e}"}).encode("utf-8")
+            return 502, body, "ERROR"
+
+    def health(self):
+        try:
+            response = self._session().get(f"{self.upstream}/health", timeout=min(self.timeout, 3))
+            upstream = "up" if response.status_code == 200 else f"status {response.status_code}"
+        except Exception:
+            upstream = "down"
+        return upstream
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+            memory = len(self._memory)
+        served = counts["memory_hits"] + counts["disk_hits"] + counts["stale_served"] + counts["misses"]
+        cached = served - counts["misses"]
+        return {
+            **counts,
+            "memory_entries": memory,
+            "disk_entries": self.disk.count(),
+            "hit_ratio": round(cached / served, 3) if served else 0.0,
+        }
+
+
+# ----------------- HTTP Service -----------------
+def create_app(proxy: CacheProxy) -> Flask:
+    app = Flask(__name__)
+
+    def reply(status, body, state):
+        return Response(body, status=status, mimetype="application/json", headers={"X-Cache": state})
+
+    @app.post("/search/<endpoint>")
+    def search(endpoint):
+        params = request.get_json(silent=True) or {}
+        key = cache_key(endpoint, params)
+        return reply(*proxy.lookup(key, endpoint, "POST", f"/search/{endpoint}", params))
+
+    @app.get("/cases/<case_id>")
+    def case_details(case_id):
+        case_id = case_id.strip()
+        return reply(*proxy.lookup(f"cases|{case_id.upper()}", "cases", "GET", f"/cases/{case_id}"))
+
+    @app.get("/health")
+    def health():
+        # Kiosks treat this as the backend health check, so report the upstream's state
+        upstream = proxy.health()
+        body = json.dumps({"status": "ok" if upstream == "up" else "degraded", "upstream": upstream})
+        return Response(body, status=200 if upstream == "up" else 503, mimetype="application/json")
+
+    @app.get("/proxy/stats")
+    def stats():
+        return Response(json.dumps(proxy.stats()), mimetype="application/json")
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared caching proxy for the kiosks' case-search backend.")
+    parser.add_argument("--upstream", default=os.getenv("CACHE_PROXY_UPSTREAM", "http://192.168.1.81:8000"))
+    parser.add_argument("--host", default=os.getenv("CACHE_PROXY_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("CACHE_PROXY_PORT", "8100")))
+    parser.add_argument("--db", default=os.getenv("CACHE_PROXY_DB", os.path.join(os.getcwd(), "cache_proxy.sqlite3")))
+    parser.add_argument("--memory-entries", type=int, default=int(os.getenv("CACHE_PROXY_MEMORY_ENTRIES", "1024")))
+    parser.add_argument("--stale-seconds", type=float, default=float(os.getenv("CACHE_PROXY_STALE_SECONDS", str(STALE_SECONDS))))
+    parser.add_argument("--ttls", default=os.getenv("API_CACHE_TTLS"), help="e.g. cnr=30,cause_list=eod,cases=120")
+    args = parser.parse_args(argv)
+
+    proxy = CacheProxy(args.upstream, args.db, memory_entries=args.memory_entries, ttls=parse_ttls(args.ttls),
+                       stale_seconds=args.stale_seconds)
+    print(f"[INFO] Cache proxy for {proxy.upstream} listening on {args.host}:{args.port}")
+    try:
+        create_app(proxy).run(host=args.host, port=args.port, threaded=True)
+    finally:
+        print(f"[INFO] Cache proxy stats: {proxy.stats()}")
+        proxy.disk.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import os
+import time
+import queue
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+from preview import PREVIEW_SIZE
+
+
+# ----------------- Worker Process -----------------
+def run_detection_worker(shm_name, size, buffers, seqs, published, displaying, paused, stop, events):
+    """
+    Entry point of the detection process. It owns the camera, the detector,
+    the tracker and the motion gate. It renders preview frames into shared
+    memory and posts only presence changes and stats back to the kiosk.
+    """
+    from frame_sources import create_frame_source
+    from vision import detection_zone, ZoneWatcher, capture_scheduler_from_env
+    from face_detectors import create_face_detector
+    from preview import draw_preview
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    width, height = size
+    frames = np.ndarray((buffers, height, width, 4), dtype=np.uint8, buffer=shm.buf)
+    bgr = np.empty((height, width, 3), dtype=np.uint8)
+
+    cap = None
+    try:
+        detector = create_face_detector()
+        scheduler = capture_scheduler_from_env()
+        watcher = ZoneWatcher(detector.detect, scheduler)
+        cap = create_frame_source()
+        events.put(("ready", {"detector": detector.name}))
+
+        present = False
+        next_index = 0
+        zone_shape = zone_box = None
+        while not stop.is_set():
+            scheduler.set_conversation(bool(paused.value))
+            ret, frame = cap.read()
+            if not ret:
+                time.sleep(0.1)
+                continue
+
+            if frame.shape != zone_shape:
+                zone_shape = frame.shape
+                zone_box = detection_zone(zone_shape[1], zone_shape[0])
+
+            if not paused.value:
+                faces = watcher.faces(frame)
+                if bool(faces) != present:
+                    present = bool(faces)
+                    events.put(("presence", present, time.time()))
+            else:
+                watcher.pause()
+                if present:
+                    present = False
+                    events.put(("presence", False, time.time()))
+
+            # Pick a buffer the kiosk is neither showing nor about to show
+            for _ in range(buffers):
+                index = next_index
+                next_index = (next_index + 1) % buffers
+                if index != displaying.value and index != published.value:
+                    break
+            # seqlock: odd while writing, even when the frame is complete
+            seqs[index] += 1
+            draw_preview(frame, bgr, frames[index], zone_box)
+            seqs[index] += 1
+            published.value = index
+
+            scheduler.wait()
+
+        events.put(("stats", {"scheduler": scheduler.stats(), **watcher.stats()}))
+    except Exception as e:
+        try:
+            events.put(("error", str(e)))
+        except Exception:
+            pass
+    finally:
+        if cap is not None:
+            cap.release()
+        del frames
+        shm.close()
+
+
+# ----------------- Kiosk-side Handle -----------------
+class DetectionProcess:
+    """
+    Runs face detection in a separate process so detector work never competes
+    with the Tk, audio and subtitle threads for the GIL.
+
+    The kiosk only reads small preview frames from shared memory and receives
+    "person present" changes over a queue. No camera frame ever crosses into
+    this process.
+    """
+
+    def __init__(self, preview_size=PREVIEW_SIZE, buffers=3):
+        ctx = mp.get_context("spawn")
+        width, height = preview_size
+        self.size = preview_size
+        self.buffers = buffers
+        self._shm = shared_memory.SharedMemory(create=True, size=buffers * width * height * 4)
+        self._frames = np.ndarray((buffers, height, width, 4), dtype=np.uint8, buffer=self._shm.buf)
+        # private copy of the frame being shown, so the worker can never change it under Tk
+        self._copy = np.empty((height, width, 4), dtype=np.uint8)
+        self._image = Image.frombuffer("RGBA", preview_size, self._copy, "raw", "RGBA", 0, 1)
+
+        self._seqs = ctx.Array("L", buffers, lock=False)
+        self._published = ctx.Value("i", -1, lock=False)
+        self._displaying = ctx.Value("i", -1, lock=False)
+        self._paused = ctx.Value("b", 0, lock=False)
+        self._stop = ctx.Event()
+        self._events = ctx.Queue(maxsize=256)
+        self._process = ctx.Process(
+            target=run_detection_worker,
+            args=(self._shm.name, preview_size, buffers, self._seqs, self._published,
+                  self._displaying, self._paused, self._stop, self._events),
+            name="face-detect",
+            daemon=True,
+        )
+
+        self.person_present = False
+        self.detector_name = None
+        self.worker_stats = None
+        self._shown = (-1, 0)
+        self.frames_shown = 0
+        self.torn_frames = 0
+        self.presence_changes = 0
+
+    # ================================== Lifecycle ======================================
+    def start(self):
+        self._process.start()
+        print(f"[INFO] Face detection running in process {self._process.pid}.")
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def stop(self, timeout=2.0):
+        if self._shm is None:
+            return
+        self._stop.set()
+        deadline = time.time() + timeout
+        # Drain while waiting so the worker's final stats can be delivered
+        while self._process.is_alive() and time.time() < deadline:
+            self.poll()
+            self._process.join(timeout=0.1)
+        self.poll()
+        if self._process.is_alive():
+            self._process.terminate()
+        del self._frames
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except Exception:
+            pass
+        self._shm = None
+
+    def set_paused(self, paused: bool):
+        self._paused.value = 1 if paused else 0
+
+    # ================================== Events =========================================
+    def poll(self) -> bool:
+        """Drain worker events; returns True when presence changed."""
+        changed = False
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                break
+            kind = event[0]
+            if kind == "presence":
+                if event[1] != self.person_present:
+                    self.person_present = event[1]
+                    self.presence_changes += 1
+                    changed = True
+            elif kind == "ready":
+                self.detector_name = event[1].get("detector")
+                print(f"[INFO] Detection worker ready ({self.detector_name}).")
+            elif kind == "stats":
+                self.worker_stats = event[1]
+            elif kind == "error":
+                print(f"[ERROR] Detection worker: {event[1]}")
+        return changed
+
+    # ================================== Preview ========================================
+    def claim_frame(self, attempts=3):
+        """
+        The newest complete preview frame as a PIL image, or None if nothing new.
+        A copy the worker overwrote midway (seqlock changed) is retried, then dropped.
+        """
+        for _ in range(attempts):
+            index = self._published.value
+            if index < 0:
+                return None
+            seq = self._seqs[index]
+            if (index, seq) == self._shown:
+                return None
+            if seq % 2:
+                continue
+            self._displaying.value = index
+            try:
+                np.copyto(self._copy, self._frames[index])
+            finally:
+                self._displaying.value = -1
+            # the worker may have started rewriting it before seeing the claim
+            if self._seqs[index] == seq:
+                self._shown = (index, seq)
+                self.frames_shown += 1
+                return self._image
+            self.torn_frames += 1
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "detector": self.detector_name,
+            "frames_shown": self.frames_shown,
+            "torn_frames": self.torn_frames,
+            "presence_changes": self.presence_changes,
+            "worker": self.worker_stats,
+        }
+
+
+def detection_mode() -> str:
+    """DETECTION_MODE: process (default) or thread."""
+    mode = os.getenv("DETECTION_MODE", "process").lower()
+    return mode if mode in ("process", "thread") else "process"
@@ -0,0 +1,287 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+import cv2
+
+from vision import detection_zone, detect_faces_in_zone, pyramid_levels, MIN_FACE_SIZE, MAX_FACE_SIZE
+
+
+# ----------------- Detector Interface -----------------
+class FaceDetector:
+    """
+    Finds faces for the kiosk trigger. `detect(frame, zone_box)` takes a BGR
+    frame and the detection-zone pixel box, and returns (x, y, w, h) boxes in
+    full-frame coordinates. Only faces completely inside the zone and within
+    [min_size, max_size] are returned.
+    """
+
+    name = "base"
+
+    def __init__(self, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE):
+        self.min_size = min_size
+        self.max_size = max_size
+
+    def detect(self, frame, zone_box) -> list:
+        raise NotImplementedError
+
+    def _keep(self, box, zone_box) -> bool:
+        x, y, w, h = box
+        x_start, y_start, x_end, y_end = zone_box
+        return (self.min_size[0] <= w <= self.max_size[0] and self.min_size[1] <= h <= self.max_size[1]
+                and x >= x_start and x + w <= x_end and y >= y_start and y + h <= y_end)
+
+
+class HaarCascadeDetector(FaceDetector):
+    """The kiosk's original frontal-face Haar cascade, run on the downscaled zone crop."""
+
+    name = "haar"
+
+    def __init__(self, cascade_path=None, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE):
+        super().__init__(min_size, max_size)
+        path = cascade_path or cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        self.cascade = cv2.CascadeClassifier(path)
+        if self.cascade.empty():
+            raise RuntimeError(f"could not load Haar cascade from {path}")
+        self.levels = pyramid_levels(min_size)
+
+    def detect(self, frame, zone_box) -> list:
+        return detect_faces_in_zone(self.cascade, frame, zone_box, min_size=self.min_size,
+                                    max_size=self.max_size, levels=self.levels)
+
+
+class _ZoneDNNDetector(FaceDetector):
+    """Shared crop/downscale/map-back logic for the DNN backends."""
+
+    def __init__(self, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE, score_threshold=0.7):
+        super().__init__(min_size, max_size)
+        self.score_threshold = score_threshold
+        # The networks find faces well below 160 px, so the same pyramid keeps them cheap
+        self.levels = pyramid_levels(min_size)
+
+    def detect(self, frame, zone_box) -> list:
+        x_start, y_start, x_end, y_end = zone_box
+        crop = frame[y_start:y_end, x_start:x_end]
+        if crop.size == 0:
+            return []
+        for _ in range(self.levels):
+            crop = cv2.pyrDown(crop)
+        factor = 2 ** self.levels
+
+        faces = []
+        for (x, y, w, h) in self._detect_crop(crop):
+            box = (int(x_start + x * factor), int(y_start + y * factor), int(w * factor), int(h * factor))
+            if self._keep(box, zone_box):
+                faces.append(box)
+        return faces
+
+    def _detect_crop(self, crop):
+        raise NotImplementedError
+
+
+class YuNetDetector(_ZoneDNNDetector):
+    """
+    OpenCV's YuNet face detector (cv2.FaceDetectorYN, OpenCV >= 4.5.4) on CPU.
+    Model: face_detection_yunet_2023mar.onnx from the OpenCV model zoo.
+    """
+
+    name = "yunet"
+
+    def __init__(self, model_path, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE, score_threshold=0.7,
+                 nms_threshold=0.3):
+        super().__init__(min_size, max_size, score_threshold)
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"YuNet model not found at {model_path}")
+        self.model = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold, nms_threshold, 50)
+        self._input_size = None
+
+    def _detect_crop(self, crop):
+        height, width = crop.shape[:2]
+        if self._input_size != (width, height):
+            self.model.setInputSize((width, height))
+            self._input_size = (width, height)
+        _, faces = self.model.detect(crop)
+        if faces is None:
+            return []
+        return [tuple(row[:4]) for row in faces if row[-1] >= self.score_threshold]
+
+
+class SSDDetector(_ZoneDNNDetector):
+    """
+    ResNet-10 SSD face detector through cv2.dnn (deploy.prototxt +
+    res10_300x300_ssd_iter_140000.caffemodel) on CPU.
+    """
+
+    name = "ssd"
+
+    def __init__(self, prototxt_path, model_path, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE, score_threshold=0.7):
+        super().__init__(min_size, max_size, score_threshold)
+        for path in (prototxt_path, model_path):
+            if not os.path.exists(path):
+                raise RuntimeError(f"SSD model file not found: {path}")
+        self.net = cv2.dnn.readNetFromCaffe(prototxt_path, model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def _detect_crop(self, crop):
+        height, width = crop.shape[:2]
+        blob = cv2.dnn.blobFromImage(crop, 1.0, (300, 300), (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()
+        boxes = []
+        for i in range(detections.shape[2]):
+            score = float(detections[0, 0, i, 2])
+            if score < self.score_threshold:
+                continue
+            x0, y0, x1, y1 = detections[0, 0, i, 3:7]
+            boxes.append((x0 * width, y0 * height, (x1 - x0) * width, (y1 - y0) * height))
+        return boxes
+
+
+class NullFaceDetector(FaceDetector):
+    """Never loads a model: returns `faces` (default none) for every frame. For tests and benchmarks."""
+
+    name = "null"
+
+    def __init__(self, faces=(), min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE):
+        super().__init__(min_size, max_size)
+        self.faces = [tuple(f) for f in faces]
+
+    def detect(self, frame, zone_box) -> list:
+        return list(self.faces)
+
+
+# ----------------- Factory -----------------
+def _model_dir():
+    return os.getenv("FACE_MODEL_DIR", os.path.join(os.getcwd(), "models"))
+
+
+def create_face_detector(name=None, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE) -> FaceDetector:
+    """
+    Build the backend named by `name` (or FACE_DETECTOR): haar, yunet, ssd or null.
+    A DNN backend whose model files are missing falls back to the Haar cascade.
+    """
+    name = (name or os.getenv("FACE_DETECTOR", "haar")).lower()
+    score = float(os.getenv("FACE_SCORE_THRESHOLD", "0.7"))
+    try:
+        if name == "yunet":
+            path = os.getenv("FACE_YUNET_MODEL", os.path.join(_model_dir(), "face_detection_yunet_2023mar.onnx"))
+            return YuNetDetector(path, min_size, max_size, score_threshold=score)
+        if name == "ssd":
+            prototxt = os.getenv("FACE_SSD_PROTOTXT", os.path.join(_model_dir(), "deploy.prototxt"))
+            model = os.getenv("FACE_SSD_MODEL", os.path.join(_model_dir(), "res10_300x300_ssd_iter_140000.caffemodel"))
+            return SSDDetector(prototxt, model, min_size, max_size, score_threshold=score)
+        if name == "null":
+            return NullFaceDetector(min_size=min_size, max_size=max_size)
+        if name != "haar":
+            print(f"[WARN] Unknown face detector '{name}'.")
+    except Exception as e:
+        print(f"[WARN] Face detector '{name}' unavailable ({e}); using the Haar cascade.")
+    return HaarCascadeDetector(min_size=min_size, max_size=max_size)
+
+
+# ----------------- Benchmark -----------------
+def _load_labels(path):
+    """
+    Labels JSON: {"<video file name>": [[start_s, end_s], ...]} with the intervals
+    in which a real visitor stands in the detection zone.
+    """
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def benchmark_video(detector, video_path, intervals=None, conversation_seconds=20.0, stride=1, tracker=None):
+    """
+    Replay one video through `detector`, then feed its detections to a
+    PresenceTracker (PRESENCE_* settings unless `tracker` is given) on video
+    time, holding it for `conversation_seconds` after each session start as
+    the kiosk does.
+    """
+    from presence import presence_tracker_from_env
+    from presence_sim import simulate_presence
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"could not open {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    latencies = []
+    timeline = []
+    index = 0
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        index += 1
+        if (index - 1) % stride:
+            continue
+
+        height, width = frame.shape[:2]
+        zone_box = detection_zone(width, height)
+        started = time.perf_counter()
+        faces = detector.detect(frame, zone_box)
+        latencies.append((time.perf_counter() - started) * 1000.0)
+
+        timeline.append(((index - 1) / fps, bool(faces)))
+    cap.release()
+
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    # Same trigger as the kiosk: a session_start from the presence tracker
+    triggers = simulate_presence(timeline, tracker or presence_tracker_from_env(), conversation_seconds)
+    latencies.sort()
+    result = {
+        "video": os.path.basename(video_path),
+        "frames": len(latencies),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2) if latencies else 0.0,
+        "cpu_percent": round(100.0 * cpu / wall, 1) if wall else 0.0,
+        "cpu_ms_per_frame": round(cpu * 1000.0 / len(latencies), 2) if latencies else 0.0,
+        "triggers": len(triggers),
+    }
+    if intervals is not None:
+        true_positive = sum(1 for t in triggers if any(start <= t <= end for start, end in intervals))
+        visits_found = sum(1 for start, end in intervals if any(start <= t <= end for t in triggers))
+        result["true_triggers"] = true_positive
+        result["false_triggers"] = len(triggers) - true_positive
+        result["precision"] = round(true_positive / len(triggers), 3) if triggers else None
+        result["visits_found"] = f"{visits_found}/{len(intervals)}"
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare face detector backends on recorded lobby videos.")
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--backends", default="haar,yunet,ssd,null")
+    parser.add_argument("--labels", default=None, help="JSON of visitor intervals per video file name")
+    parser.add_argument("--conversation-seconds", type=float, default=20.0,
+                        help="how long each triggered conversation holds the presence tracker")
+    parser.add_argument("--stride", type=int, default=1, help="process every Nth frame")
+    args = parser.parse_args(argv)
+
+    labels = _load_labels(args.labels)
+    for name in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        detector = create_face_detector(name)
+        if detector.name != name:
+            print(f"[WARN] Skipping '{name}': backend not available here.")
+            continue
+        for video in args.videos:
+            intervals = labels.get(os.path.basename(video)) if labels else None
+            try:
+                result = benchmark_video(detector, video, intervals, conversation_seconds=args.conversation_seconds,
+                                         stride=args.stride)
+            except Exception as e:
+                print(f"[ERROR] {name} on {video}: {e}")
+                continue
+            print(f"[INFO] {name}: {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import time
+import threading
+from collections import deque
+
+
+# ----------------- Single-slot Queue -----------------
+class LatestSlot:
+    """
+    Hand-off between two pipeline stages that holds at most one item.
+    A new `put()` replaces an item the consumer has not taken yet (latest frame
+    wins), so a slow stage never builds a backlog. Every replacement is counted
+    as a drop, which is the backpressure signal for the downstream stage.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._cond = threading.Condition()
+        self._item = None
+        self._stamp = 0.0
+        self._full = False
+
+        self.puts = 0
+        self.taken = 0
+        self.dropped = 0
+        self._ages_ms = deque(maxlen=240)
+
+    def put(self, item):
+        with self._cond:
+            if self._full:
+                self.dropped += 1
+            self._item = item
+            self._stamp = time.time()
+            self._full = True
+            self.puts += 1
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Take the pending item, waiting up to `timeout` seconds; None if nothing arrived."""
+        with self._cond:
+            if not self._full:
+                self._cond.wait(timeout=timeout)
+            if not self._full:
+                return None
+            item = self._item
+            self._ages_ms.append((time.time() - self._stamp) * 1000.0)
+            self._item = None
+            self._full = False
+            self.taken += 1
+            return item
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+    def stats(self) -> dict:
+        ages = list(self._ages_ms)
+        return {
+            "puts": self.puts,
+            "taken": self.taken,
+            "dropped": self.dropped,
+            "drop_ratio": round(self.dropped / self.puts, 3) if self.puts else 0.0,
+            "mean_wait_ms": round(sum(ages) / len(ages), 1) if ages else 0.0,
+        }
+
+
+# ----------------- Stage Timing -----------------
+class StageTimer:
+    """Rolling per-stage processing time, so a slow stage shows up next to its slot's drops."""
+
+    def __init__(self, name, history=240):
+        self.name = name
+        self.count = 0
+        self._samples = deque(maxlen=history)
+        self._started = None
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._samples.append((time.perf_counter() - self._started) * 1000.0)
+        self.count += 1
+        return False
+
+    def stats(self) -> dict:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": self.count, "mean_ms": 0.0, "p95_ms": 0.0}
+        return {
+            "count": self.count,
+            "mean_ms": round(sum(samples) / len(samples), 2),
+            "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        }
@@ -0,0 +1,273 @@
+import os
+import glob
+import time
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# ----------------- Frame Source Interface -----------------
+class FrameSource:
+    """
+    Where the vision loop gets its frames. It mirrors the parts of
+    `cv2.VideoCapture` the kiosk uses (`read`, `set`, `isOpened`, `release`),
+    so a source drops in wherever a capture was used before.
+    """
+
+    name = "base"
+
+    def read(self):
+        raise NotImplementedError
+
+    def set(self, prop, value):
+        return False
+
+    def isOpened(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+    @property
+    def position(self) -> float:
+        """Media time of the last frame, in seconds (wall time for live devices)."""
+        return time.time()
+
+
+class DeviceSource(FrameSource):
+    """A live camera (the kiosk default, device 0)."""
+
+    name = "device"
+
+    def __init__(self, index=0):
+        self.cap = cv2.VideoCapture(index)
+        try:
+            # At idle frame rates a deep driver buffer would hand back stale frames
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        except Exception:
+            pass
+
+    def read(self):
+        return self.cap.read()
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class _ReplaySource(FrameSource):
+    """
+    Shared pacing for recorded and generated frames. In real-time mode `read()`
+    behaves like a camera: it returns the frame for the current wall-clock time
+    and skips the ones the caller was too slow for. Otherwise every frame is
+    returned as fast as the caller asks.
+    """
+
+    def __init__(self, fps, realtime=True, loop=False):
+        self.fps = float(fps) if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self._index = 0
+        self._started = None
+        self._last = -1
+        self.frames_read = 0
+        self.frames_skipped = 0
+
+    @property
+    def length(self):
+        """Number of frames, or None for endless sources."""
+        return None
+
+    def _frame_at(self, index):
+        raise NotImplementedError
+
+    def _skip(self, count):
+        """Advance past `count` frames without decoding them when possible."""
+
+    def _rewind(self):
+        pass
+
+    def read(self):
+        target = self._index
+        if self.realtime:
+            now = time.time()
+            if self._started is None:
+                self._started = now
+            due = int((now - self._started) * self.fps)
+            if due < self._index:
+                # never faster than the recording
+                time.sleep((self._index - due) / self.fps)
+            elif due > self._index:
+                target = due
+
+        length = self.length
+        if length is not None and target >= length:
+            if not self.loop or length == 0:
+                return False, None
+            self._rewind()
+            self._index = target = 0
+            self._started = time.time() if self.realtime else None
+
+        if target > self._index:
+            self._skip(target - self._index)
+            self.frames_skipped += target - self._index
+
+        frame = self._frame_at(target)
+        if frame is None:
+            return False, None
+        self._last = target
+        self._index = target + 1
+        self.frames_read += 1
+        return True, frame
+
+    @property
+    def position(self) -> float:
+        return max(0, self._last) / self.fps
+
+
+class VideoFileSource(_ReplaySource):
+    """A recorded video, paced by its own frame rate."""
+
+    name = "video"
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"could not open video {path}")
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS), realtime, loop)
+        count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self._length = count if count > 0 else None
+
+    @property
+    def length(self):
+        return self._length
+
+    def _skip(self, count):
+        for _ in range(count):
+            if not self.cap.grab():
+                break
+
+    def _rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def _frame_at(self, index):
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(_ReplaySource):
+    """Still images from a directory, in name order, shown at `fps`."""
+
+    name = "images"
+
+    def __init__(self, directory, fps=10.0, realtime=True, loop=False):
+        super().__init__(fps, realtime, loop)
+        self.paths = sorted(p for p in glob.glob(os.path.join(directory, "*"))
+                            if p.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise RuntimeError(f"no images in {directory}")
+
+    @property
+    def length(self):
+        return len(self.paths)
+
+    def _frame_at(self, index):
+        return cv2.imread(self.paths[index])
+
+
+class SyntheticSource(_ReplaySource):
+    """
+    Generated lobby frames: a noisy static background and, during each
+    `visits` interval of every `period` seconds, a visitor patch at the centre
+    of the detection zone. The patch is `face_image` when given (so real
+    detectors can fire), otherwise a textured block that exercises the motion
+    gate and tracker.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, width=640, height=480, fps=15.0, realtime=True, visits=((5.0, 25.0),), period=60.0,
+                 face_image=None, face_size=200, seed=0):
+        super().__init__(fps, realtime, loop=False)
+        rng = np.random.default_rng(seed)
+        self.width, self.height = width, height
+        self.visits = tuple(visits)
+        self.period = period
+        self._background = rng.integers(60, 120, (height, width, 3), dtype=np.uint8)
+        self._noise = [rng.integers(0, 6, (height, width, 3), dtype=np.uint8) for _ in range(4)]
+
+        size = min(face_size, width // 2, height // 2)
+        if face_image:
+            patch = cv2.imread(face_image)
+            if patch is None:
+                raise RuntimeError(f"could not read face image {face_image}")
+            self._patch = cv2.resize(patch, (size, size))
+        else:
+            self._patch = rng.integers(0, 255, (size, size, 3), dtype=np.uint8)
+
+    def visiting(self, t) -> bool:
+        phase = t % self.period if self.period else t
+        return any(start <= phase < end for start, end in self.visits)
+
+    def _frame_at(self, index):
+        t = index / self.fps
+        # a fresh array per frame: pipeline stages may still hold the previous one
+        frame = self._background + self._noise[index % len(self._noise)]
+        if self.visiting(t):
+            size = self._patch.shape[0]
+            # a little sway so the tracker has something to follow
+            x = self.width // 2 - size // 2 + int(6 * np.sin(t * 2.0))
+            y = self.height // 2 - size // 2
+            frame[y:y + size, x:x + size] = self._patch
+        return frame
+
+
+# ----------------- Factory -----------------
+def create_frame_source(spec=None, realtime=None, loop=None) -> FrameSource:
+    """
+    Build the source named by `spec` (or CAMERA_SOURCE):
+        device:0 | 0                 live camera (default)
+        video:<file>                 recorded video
+        images:<dir>[@fps]           image directory
+        synthetic[:WxH[@fps]]        generated frames
+    CAMERA_REPLAY=fast replays as fast as possible instead of in real time;
+    CAMERA_LOOP=1 restarts recordings at the end.
+    """
+    spec = (spec or os.getenv("CAMERA_SOURCE", "device:0")).strip()
+    if realtime is None:
+        realtime = os.getenv("CAMERA_REPLAY", "realtime").lower() != "fast"
+    if loop is None:
+        loop = os.getenv("CAMERA_LOOP", "0") == "1"
+
+    kind, _, arg = spec.partition(":")
+    if kind.isdigit():
+        kind, arg = "device", kind
+    try:
+        if kind == "device":
+            return DeviceSource(int(arg or 0))
+        if kind == "video":
+            return VideoFileSource(arg, realtime=realtime, loop=loop)
+        if kind == "images":
+            directory, _, fps = arg.partition("@")
+            return ImageDirectorySource(directory, fps=float(fps or 10), realtime=realtime, loop=loop)
+        if kind == "synthetic":
+            size, _, fps = arg.partition("@")
+            width, _, height = (size or "640x480").partition("x")
+            return SyntheticSource(int(width), int(height), fps=float(fps or 15), realtime=realtime)
+        print(f"[WARN] Unknown camera source '{spec}'.")
+    except Exception as e:
+        print(f"[WARN] Camera source '{spec}' unavailable ({e}); using device 0.")
+    return DeviceSource(0)
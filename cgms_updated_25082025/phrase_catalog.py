@@ -0,0 +1,234 @@
+import os
+import ast
+import sys
+import json
+import hashlib
+import argparse
+import datetime
+
+CATALOG_VERSION = 1
+CATALOG_LANGUAGES = ("pa", "hi", "en")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE_PATH = os.path.join(BASE_DIR, "sangrur_main.py")
+DEFAULT_CATALOG_PATH = os.path.join(BASE_DIR, "phrase_catalog.json")
+
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so indented triple-quoted prompts match their catalog key."""
+    return " ".join(text.split())
+
+
+# ----------------- Phrase Collection -----------------
+def _literal(node):
+    """Return the string value of a constant or a placeholder-free f-string, else None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr) and all(isinstance(v, ast.Constant) for v in node.values):
+        return "".join(v.value for v in node.values)
+    return None
+
+
+class _PromptCollector(ast.NodeVisitor):
+    """Walks the source collecting fixed English prompts handed to translate_text()."""
+
+    def __init__(self):
+        self.scopes = [{}]
+        self.phrases = {}
+
+    def visit_FunctionDef(self, node):
+        self.scopes.append({})
+        self.generic_visit(node)
+        self.scopes.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        value = _literal(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if value is None:
+                    self.scopes[-1].pop(target.id, None)
+                else:
+                    self.scopes[-1][target.id] = value
+
+    def _resolve(self, node):
+        value = _literal(node)
+        if value is None and isinstance(node, ast.Name):
+            for scope in reversed(self.scopes):
+                if node.id in scope:
+                    return scope[node.id]
+        return value
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute) and node.func.attr == "translate_text":
+            keywords = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+            text_node = node.args[0] if node.args else keywords.get("text")
+            source_node = node.args[1] if len(node.args) > 1 else keywords.get("source")
+
+            text = self._resolve(text_node) if text_node is not None else None
+            source = _literal(source_node) if source_node is not None else None
+            if text and source == "en":
+                key = normalize(text)
+                if key and key not in self.phrases:
+                    self.phrases[key] = text
+        self.generic_visit(node)
+
+
+def collect_phrases(source_path=DEFAULT_SOURCE_PATH) -> list:
+    """Return every fixed English prompt passed to translate_text() in the source file."""
+    with open(source_path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=source_path)
+
+    collector = _PromptCollector()
+    collector.visit(tree)
+    return [collector.phrases[key] for key in sorted(collector.phrases)]
+
+
+def phrases_hash(phrases) -> str:
+    digest = hashlib.sha1()
+    for phrase in sorted(normalize(p) for p in phrases):
+        digest.update(phrase.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# ----------------- Catalog Build -----------------
+def build_catalog(source_path=DEFAULT_SOURCE_PATH, catalog_path=DEFAULT_CATALOG_PATH, languages=CATALOG_LANGUAGES):
+    """Pre-translate every fixed prompt and write a versioned catalog file."""
+    from deep_translator import GoogleTranslator
+
+    phrases = collect_phrases(source_path)
+    translators = {lang: GoogleTranslator(source="en", target=lang) for lang in languages if lang != "en"}
+
+    entries = {}
+    failures = 0
+    for phrase in phrases:
+        entry = {}
+        for lang in languages:
+            if lang == "en":
+                entry[lang] = phrase
+                continue
+            try:
+                entry[lang] = translators[lang].translate(phrase)
+            except Exception as e:
+                failures += 1
+                print(f"[WARN] Could not translate to {lang}: {normalize(phrase)[:60]!r} ({e})")
+        entries[normalize(phrase)] = entry
+
+    catalog = {
+        "version": CATALOG_VERSION,
+        "source_hash": phrases_hash(phrases),
+        "built_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "languages": list(languages),
+        "phrases": entries,
+    }
+
+    tmp_path = catalog_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(catalog, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, catalog_path)
+
+    print(f"[INFO] Wrote {len(entries)} phrases x {len(languages)} languages to {catalog_path} ({failures} failures).")
+    return catalog
+
+
+# ----------------- Runtime Lookup -----------------
+class PhraseCatalog:
+    """Read-only view of the pre-built phrase catalog consulted before the live translator."""
+
+    def __init__(self, path=DEFAULT_CATALOG_PATH, source_path=DEFAULT_SOURCE_PATH):
+        self.path = path
+        self.source_path = source_path
+        self.version = None
+        self.phrases = {}
+        self.stale = False
+        self.hits = 0
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            print(f"[WARN] Phrase catalog not found at {self.path}. Run 'python phrase_catalog.py build'.")
+            return
+        except Exception as e:
+            print(f"[WARN] Could not load phrase catalog: {e}")
+            return
+
+        if data.get("version") != CATALOG_VERSION:
+            print(f"[WARN] Phrase catalog version {data.get('version')} does not match {CATALOG_VERSION}. Ignoring it.")
+            return
+
+        self.version = data["version"]
+        self.phrases = data.get("phrases", {})
+        print(f"[INFO] Loaded {len(self.phrases)} catalog phrases from {self.path}.")
+        self._check_source(data.get("source_hash"))
+
+    def _check_source(self, source_hash):
+        """Warn when the prompts in the source no longer match the ones the catalog was built from."""
+        if not self.source_path or not os.path.exists(self.source_path):
+            return
+        try:
+            phrases = collect_phrases(self.source_path)
+        except Exception as e:
+            print(f"[WARN] Could not read prompts from {self.source_path} to check the catalog: {e}")
+            return
+        if source_hash == phrases_hash(phrases):
+            return
+
+        # Entries are keyed by the prompt text, so the ones still present stay valid
+        self.stale = True
+        current = {normalize(p) for p in phrases}
+        missing = len(current - set(self.phrases))
+        unused = len(set(self.phrases) - current)
+        print(f"[WARN] Phrase catalog is out of date with {os.path.basename(self.source_path)} "
+              f"({missing} new prompts will use the live translator, {unused} unused). "
+              f"Run 'python phrase_catalog.py build'.")
+
+    def lookup(self, text, source, target):
+        """Return the pre-built translation of a fixed English prompt, or None."""
+        if source != "en" or not self.phrases:
+            return None
+        entry = self.phrases.get(normalize(text))
+        if entry is None:
+            return None
+        translated = entry.get(target)
+        if translated is not None:
+            self.hits += 1
+        return translated
+
+    def __len__(self):
+        return len(self.phrases)
+
+
+# ----------------- Main Runner -----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline phrase catalog for the kiosk conversation flow.")
+    parser.add_argument("command", choices=["build", "list", "check"])
+    parser.add_argument("--source", default=DEFAULT_SOURCE_PATH)
+    parser.add_argument("--out", default=DEFAULT_CATALOG_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for phrase in collect_phrases(args.source):
+            print(normalize(phrase))
+        return 0
+
+    if args.command == "check":
+        phrases = collect_phrases(args.source)
+        catalog = PhraseCatalog(args.out, args.source)
+        missing = [p for p in phrases if normalize(p) not in catalog.phrases]
+        print(f"[INFO] {len(phrases) - len(missing)}/{len(phrases)} fixed prompts are in the catalog.")
+        for phrase in missing:
+            print(f"   missing: {normalize(phrase)}")
+        return 1 if missing or catalog.stale else 0
+
+    build_catalog(args.source, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
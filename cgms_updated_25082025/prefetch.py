@@ -0,0 +1,163 @@
+import os
+import datetime
+import threading
+from collections import Counter
+
+from api_cache import cache_key
+
+# Spoken case statuses and cause-list case types, in the backend's spelling
+DEFAULT_STATUSES = ("Pending", "Disposed")
+DEFAULT_COURT_TYPES = ("Civil", "Criminal")
+
+
+def _split(spec, default):
+    values = tuple(v.strip() for v in (spec or "").split(",") if v.strip())
+    return values or default
+
+
+# ----------------- Prefetch Engine -----------------
+class PrefetchEngine:
+    """
+    Speculative searches while the visitor is still answering prompts.
+
+    Once every field of a search but one is known, `speculate()` submits the
+    search for the few likeliest values of the missing field (values seen
+    before on this kiosk first, then the defaults). The answers land in the
+    API client's response cache, so when the visitor finishes, `_search()`
+    gets a cache hit, or joins a speculation still in flight. `resolve()`
+    records which happened and cancels the speculations that guessed wrong.
+    """
+
+    def __init__(self, client, max_candidates=3, statuses=DEFAULT_STATUSES, court_types=DEFAULT_COURT_TYPES):
+        self.client = client
+        self.max_candidates = max_candidates
+        self.defaults = {
+            "status": tuple(statuses),
+            "court_type": tuple(court_types),
+        }
+        self._learned = {}  # (endpoint, field) -> Counter of final values
+        self._open = {}  # endpoint -> {key: future}
+        self._lock = threading.Lock()
+
+        self.issued = 0
+        self.ready = 0
+        self.joined = 0
+        self.missed = 0
+        self.wasted = 0
+
+    def _default_values(self, field):
+        if field == "year":
+            year = datetime.date.today().year
+            return (str(year), str(year - 1))
+        return self.defaults.get(field, ())
+
+    def candidates(self, endpoint, field) -> list:
+        """Likeliest values for `field`: most used on this kiosk first, then the defaults."""
+        with self._lock:
+            learned = [value for value, _ in self._learned.get((endpoint, field), Counter()).most_common()]
+        values, seen = [], set()
+        for value in learned + list(self._default_values(field)):
+            folded = " ".join(str(value).split()).casefold()
+            if folded and folded not in seen:
+                seen.add(folded)
+                values.append(value)
+        return values[:self.max_candidates]
+
+    def speculate(self, endpoint, known: dict, field) -> int:
+        """Prefetch `endpoint` for each candidate value of `field`. Returns how many were submitted."""
+        # a field that was not understood makes the whole query implausible
+        if not known or any(str(value).strip() in ("", "None") for value in known.values()):
+            return 0
+        # no point guessing while the backend is known to be down
+        if not self.client.backend_available():
+            return 0
+
+        submitted = 0
+        for value in self.candidates(endpoint, field):
+            params = dict(known, **{field: value})
+            key = cache_key(endpoint, params)
+            with self._lock:
+                if key in self._open.setdefault(endpoint, {}):
+                    continue
+            future = self.client.submit(endpoint, params, speculative=True)
+            with self._lock:
+                self._open[endpoint][key] = future
+                self.issued += 1
+            submitted += 1
+        if submitted:
+            print(f"[INFO] Prefetching {submitted} '{endpoint}' search(es) while '{field}' is asked.")
+        return submitted
+
+    def resolve(self, endpoint, params) -> str:
+        """
+        Called with the final search, before it is sent. Returns "ready" (the
+        answer is already cached), "joined" (still in flight), "missed" (no
+        speculation matched) or "none" (nothing was speculated).
+        """
+        key = cache_key(endpoint, params)
+        with self._lock:
+            speculated = self._open.pop(endpoint, {})
+        if not speculated:
+            return "none"
+
+        match = speculated.pop(key, None)
+        # wrong guesses: aborted if still running, their answers simply expire otherwise
+        for future in speculated.values():
+            future.cancel()
+
+        if match is None or match.cancelled():
+            outcome = "missed"
+        elif not match.done():
+            outcome = "joined"
+        elif match.exception() is None and match.result().get("status") == 200:
+            outcome = "ready"
+        else:
+            # the speculation failed, so nothing was cached
+            outcome = "missed"
+        with self._lock:
+            self.wasted += len(speculated)
+            setattr(self, outcome, getattr(self, outcome) + 1)
+        return outcome
+
+    def learn(self, endpoint, params, fields=("year", "status", "court_type")):
+        """Remember the values the visitor actually gave, to rank later candidates."""
+        with self._lock:
+            for field in fields:
+                value = params.get(field)
+                if value is not None and str(value).strip():
+                    self._learned.setdefault((endpoint, field), Counter())[str(value)] += 1
+
+    def cancel(self) -> int:
+        """Cancel every open speculation (stop/reset)."""
+        with self._lock:
+            open_requests = [future for futures in self._open.values() for future in futures.values()]
+            self._open.clear()
+        cancelled = sum(1 for future in open_requests if future.cancel())
+        with self._lock:
+            self.wasted += len(open_requests)
+        return cancelled
+
+    def stats(self) -> dict:
+        speculated = self.ready + self.joined + self.missed
+        return {
+            "issued": self.issued,
+            "ready": self.ready,
+            "joined": self.joined,
+            "missed": self.missed,
+            "wasted": self.wasted,
+            # share of speculated searches answered (or started) before the visitor finished
+            "hit_rate": round((self.ready + self.joined) / speculated, 3) if speculated else 0.0,
+            "useful_ratio": round((self.ready + self.joined) / self.issued, 3) if self.issued else 0.0,
+        }
+
+
+def prefetch_engine_from_env(client):
+    """PrefetchEngine from PREFETCH_* settings, or None when PREFETCH=0 or nothing caches the answers."""
+    if os.getenv("PREFETCH", "1") == "0" or getattr(client, "cache", None) is None:
+        return None
+    return PrefetchEngine(
+        client,
+        max_candidates=int(os.getenv("PREFETCH_MAX_CANDIDATES", "3")),
+        statuses=_split(os.getenv("PREFETCH_STATUSES"), DEFAULT_STATUSES),
+        court_types=_split(os.getenv("PREFETCH_COURT_TYPES"), DEFAULT_COURT_TYPES),
+    )
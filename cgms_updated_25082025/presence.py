@@ -0,0 +1,141 @@
+import os
+import time
+
+
+# ----------------- Presence State Machine -----------------
+class PresenceTracker:
+    """
+    Turns the per-frame "face in zone" signal into one `session_start` per visitor.
+
+        absent   --face-->               entering
+        entering --face for enter_s-->   present   (emits session_start unless held)
+        entering --no face for gap_s-->  absent    (a walk-by or a detector flicker)
+        present  --no face-->            leaving
+        leaving  --face-->               present   (same visitor, no new session)
+        leaving  --no face for exit_s--> absent    (emits session_end)
+
+    While `held` (a conversation is running), updates are ignored. A visitor
+    who reaches `present` while held never gets a session_start: they are
+    already being served. On release, the exit timer restarts, so someone who
+    left during the conversation is dropped after `exit_seconds`. Someone
+    still standing there, or first seen within `exit_seconds` of the release,
+    is not greeted a second time.
+
+    Exactly one thread should call `update()`; it is the single owner of the
+    trigger decision.
+    """
+
+    ABSENT, ENTERING, PRESENT, LEAVING = "absent", "entering", "present", "leaving"
+
+    def __init__(self, enter_seconds=0.6, gap_seconds=0.4, exit_seconds=3.0, on_event=None):
+        self.enter_seconds = enter_seconds
+        self.gap_seconds = gap_seconds
+        self.exit_seconds = exit_seconds
+        self.on_event = on_event
+
+        self.state = self.ABSENT
+        self.held = False
+        self._entered_at = None
+        self._last_seen = None
+        self._served = False
+        self._released_at = None
+
+        self.sessions = 0
+        self.suppressed = 0
+        self.flickers = 0
+        self.transitions = []
+
+    def _set_state(self, state, now):
+        if state != self.state:
+            self.transitions.append((now, self.state, state))
+            if len(self.transitions) > 200:
+                del self.transitions[:100]
+            self.state = state
+
+    def _emit(self, name, now, events):
+        events.append((name, now))
+        if self.on_event is not None:
+            try:
+                self.on_event(name, now)
+            except Exception as e:
+                print(f"[ERROR] Presence handler failed for {name}: {e}")
+
+    def set_held(self, held: bool, now=None):
+        """Freeze presence while a conversation runs; restart the exit timer on release."""
+        held = bool(held)
+        if held == self.held:
+            return
+        now = time.time() if now is None else now
+        self.held = held
+        if not held:
+            self._released_at = now
+            if self.state in (self.PRESENT, self.LEAVING):
+                self._last_seen = now
+
+    def update(self, detected: bool, now=None) -> list:
+        """Feed one observation; returns the events it caused as (name, timestamp)."""
+        now = time.time() if now is None else now
+        events = []
+        if self.held:
+            # Someone served during the conversation counts as served
+            if self.state == self.ENTERING:
+                self._served = True
+            return events
+
+        if self.state == self.ABSENT:
+            if detected:
+                self._entered_at = now
+                self._last_seen = now
+                # Detection is off during a conversation, so whoever is seen right
+                # after release was most likely the person just served
+                self._served = self._released_at is not None and now - self._released_at <= self.exit_seconds
+                self._set_state(self.ENTERING, now)
+
+        elif self.state == self.ENTERING:
+            if detected:
+                self._last_seen = now
+                if now - self._entered_at >= self.enter_seconds:
+                    self._set_state(self.PRESENT, now)
+                    if self._served:
+                        self.suppressed += 1
+                    else:
+                        self._served = True
+                        self.sessions += 1
+                        self._emit("session_start", now, events)
+            elif now - self._last_seen > self.gap_seconds:
+                self.flickers += 1
+                self._set_state(self.ABSENT, now)
+
+        elif self.state == self.PRESENT:
+            if detected:
+                self._last_seen = now
+            else:
+                self._set_state(self.LEAVING, now)
+
+        elif self.state == self.LEAVING:
+            if detected:
+                self._last_seen = now
+                self._set_state(self.PRESENT, now)
+            elif now - self._last_seen >= self.exit_seconds:
+                self._set_state(self.ABSENT, now)
+                self._emit("session_end", now, events)
+
+        return events
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "held": self.held,
+            "sessions": self.sessions,
+            "suppressed": self.suppressed,
+            "flickers": self.flickers,
+        }
+
+
+def presence_tracker_from_env(on_event=None) -> PresenceTracker:
+    return PresenceTracker(
+        enter_seconds=float(os.getenv("PRESENCE_ENTER_SECONDS", "0.6")),
+        gap_seconds=float(os.getenv("PRESENCE_GAP_SECONDS", "0.4")),
+        exit_seconds=float(os.getenv("PRESENCE_EXIT_SECONDS", "3.0")),
+        on_event=on_event,
+    )
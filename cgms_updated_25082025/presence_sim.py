@@ -0,0 +1,108 @@
+import sys
+import random
+import argparse
+
+from presence import PresenceTracker
+
+# ----------------- Scenarios -----------------
+# Each scenario: visitor intervals (start_s, end_s) in the zone, detector miss
+# rate while someone is there, false-positive rate while nobody is, total
+# length, and the number of session_start events the kiosk should emit.
+SCENARIOS = {
+    "walk_by":          {"visits": [(2.0, 2.3)], "miss": 0.0, "false": 0.0, "length": 20, "expected": 0},
+    "single_visitor":   {"visits": [(2.0, 60.0)], "miss": 0.05, "false": 0.0, "length": 80, "expected": 1},
+    "false_positives":  {"visits": [], "miss": 0.0, "false": 0.02, "length": 300, "expected": 0},
+    "back_to_back":     {"visits": [(2.0, 40.0), (45.0, 90.0)], "miss": 0.05, "false": 0.0, "length": 110, "expected": 2},
+    "stays_after_talk": {"visits": [(2.0, 120.0)], "miss": 0.05, "false": 0.0, "length": 140, "expected": 1},
+    "looks_away":       {"visits": [(2.0, 30.0), (31.5, 50.0)], "miss": 0.05, "false": 0.0, "length": 70, "expected": 1},
+    "heavy_occlusion":  {"visits": [(2.0, 60.0)], "miss": 0.3, "false": 0.0, "length": 80, "expected": 1},
+}
+
+
+def detection_timeline(scenario, fps, rng):
+    """Synthetic per-frame detector output: (timestamp, face_in_zone)."""
+    frames = []
+    for i in range(int(scenario["length"] * fps)):
+        t = i / float(fps)
+        visiting = any(start <= t < end for start, end in scenario["visits"])
+        if visiting:
+            detected = rng.random() >= scenario["miss"]
+        else:
+            detected = rng.random() < scenario["false"]
+        frames.append((t, detected))
+    return frames
+
+
+# ----------------- Simulation -----------------
+def simulate_presence(frames, tracker, conversation_seconds):
+    """Run the tracker; every session_start holds it for a conversation, like the kiosk does."""
+    held_until = None
+    starts = []
+    for t, detected in frames:
+        if held_until is not None and t >= held_until:
+            held_until = None
+        tracker.set_held(held_until is not None, now=t)
+        for name, stamp in tracker.update(detected, now=t):
+            if name == "session_start":
+                starts.append(stamp)
+                held_until = t + conversation_seconds
+    return starts
+
+
+def simulate_legacy(frames, conversation_seconds, reset_seconds=30.0, cooldown=10.0):
+    """
+    The old rule: any frame with a face triggers unless face_detection_cooldown
+    is set or the last trigger was within `cooldown` seconds. camera_pause and
+    the cooldown are cleared by the inactivity reset, `reset_seconds` after
+    the conversation's last action.
+    """
+    blocked_until = -1.0
+    last = -cooldown - 1
+    starts = []
+    for t, detected in frames:
+        if detected and t >= blocked_until and t - last > cooldown:
+            starts.append(t)
+            last = t
+            blocked_until = t + conversation_seconds + reset_seconds
+    return starts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay synthetic detection timelines through the presence tracker.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=None, help="run one scenario (default: all)")
+    parser.add_argument("--fps", type=float, default=10.0, help="detector frames per second")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--conversation-seconds", type=float, default=20.0)
+    parser.add_argument("--enter-seconds", type=float, default=0.6)
+    parser.add_argument("--gap-seconds", type=float, default=0.4)
+    parser.add_argument("--exit-seconds", type=float, default=3.0)
+    parser.add_argument("--verbose", action="store_true", help="print state transitions")
+    args = parser.parse_args(argv)
+
+    names = [args.scenario] if args.scenario else list(SCENARIOS)
+    failures = 0
+    print(f"{'scenario':<18} {'expected':>8} {'sessions':>8} {'legacy':>7} {'flickers':>8} {'suppressed':>10}  result")
+    for name in names:
+        scenario = SCENARIOS[name]
+        frames = detection_timeline(scenario, args.fps, random.Random(f"{args.seed}:{name}"))
+        tracker = PresenceTracker(args.enter_seconds, args.gap_seconds, args.exit_seconds)
+        starts = simulate_presence(frames, tracker, args.conversation_seconds)
+        legacy = simulate_legacy(frames, args.conversation_seconds)
+
+        ok = len(starts) == scenario["expected"]
+        failures += 0 if ok else 1
+        print(f"{name:<18} {scenario['expected']:>8} {len(starts):>8} {len(legacy):>7} "
+              f"{tracker.flickers:>8} {tracker.suppressed:>10}  {'PASS' if ok else 'FAIL'}")
+        if args.verbose:
+            for stamp, old, new in tracker.transitions:
+                print(f"    {stamp:7.2f}s  {old} -> {new}")
+
+    if failures:
+        print(f"[ERROR] {failures} scenario(s) did not produce the expected sessions.")
+        return 1
+    print("[INFO] All presence scenarios passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import sys
+import time
+import argparse
+import threading
+import tracemalloc
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from vision import detection_zone, MIN_FACE_SIZE, MAX_FACE_SIZE
+
+# Size of the camera preview on screen (matches the old CTkImage size)
+PREVIEW_SIZE = (920, 460)
+
+
+# Overlay text on the preview; it never changes, so it is built once
+PREVIEW_LABELS = (
+    ("Detection Range", (10, 30), 0.7, (255, 255, 255)),
+    (f"Min: {MIN_FACE_SIZE[0]}px", (10, 60), 0.6, (255, 200, 0)),
+    (f"Max: {MAX_FACE_SIZE[0]}px", (10, 90), 0.6, (255, 200, 0)),
+)
+
+
+def draw_preview(frame, bgr, rgba, zone_box=None, labels=PREVIEW_LABELS):
+    """
+    Resize `frame` into the preallocated `bgr` buffer, convert it into `rgba`
+    and draw the overlays there. Nothing is allocated per frame.
+    """
+    size = (rgba.shape[1], rgba.shape[0])
+    cv2.resize(frame, size, dst=bgr, interpolation=cv2.INTER_LINEAR)
+    cv2.cvtColor(bgr, cv2.COLOR_BGR2RGBA, dst=rgba)
+
+    if zone_box is not None:
+        # Zone is in camera coordinates; scale it to the preview
+        height, width = frame.shape[:2]
+        sx, sy = size[0] / float(width), size[1] / float(height)
+        x_start, y_start, x_end, y_end = zone_box
+        cv2.rectangle(rgba, (int(x_start * sx), int(y_start * sy)), (int(x_end * sx), int(y_end * sy)),
+                      (0, 255, 0, 255), 2)
+    for text, origin, scale, colour in labels:
+        cv2.putText(rgba, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, colour + (255,), 2)
+
+
+# ----------------- Preview Renderer -----------------
+class PreviewRenderer:
+    """
+    Renders camera frames for the Tk preview without per-frame allocations.
+
+    Each frame is resized once into a preallocated BGR buffer. It is then
+    converted into one of a few preallocated RGBA buffers, and the overlays are
+    drawn there. Every RGBA buffer is wrapped by a PIL image that shares its
+    memory (`Image.frombuffer`), and the Tk side pastes that into a single
+    persistent `PhotoImage`. The renderer never writes into the buffer that is
+    queued for display or currently being pasted, so there is no tearing.
+    """
+
+    def __init__(self, size=PREVIEW_SIZE, buffers=3):
+        self.size = size
+        width, height = size
+        self._bgr = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgba = [np.empty((height, width, 4), dtype=np.uint8) for _ in range(max(3, buffers))]
+        # PIL views over the RGBA buffers; they follow every write into the arrays
+        self._images = [Image.frombuffer("RGBA", size, buf, "raw", "RGBA", 0, 1) for buf in self._rgba]
+
+        self._lock = threading.Lock()
+        self._next = 0
+        self._queued = None
+        self._displaying = None
+        self.frames = 0
+        self.displayed = 0
+        self.dropped = 0
+
+    def _free_index(self) -> int:
+        with self._lock:
+            for _ in range(len(self._rgba)):
+                index = self._next
+                self._next = (self._next + 1) % len(self._rgba)
+                if index != self._queued and index != self._displaying:
+                    return index
+        raise RuntimeError("no free preview buffer")
+
+    def render(self, frame, zone_box=None, labels=PREVIEW_LABELS) -> int:
+        """Resize, convert and annotate `frame` and queue it for display; returns the buffer index."""
+        index = self._free_index()
+        draw_preview(frame, self._bgr, self._rgba[index], zone_box, labels)
+
+        with self._lock:
+            if self._queued is not None:
+                # the Tk side never showed the previous frame: latest wins
+                self.dropped += 1
+            self._queued = index
+        self.frames += 1
+        return index
+
+    # Called on the Tk thread around the paste into the PhotoImage
+    def begin_display(self):
+        """Claim the newest rendered frame as a PIL image, or None if nothing new."""
+        with self._lock:
+            index = self._queued
+            if index is None:
+                return None
+            self._queued = None
+            self._displaying = index
+        self.displayed += 1
+        return self._images[index]
+
+    def end_display(self):
+        with self._lock:
+            self._displaying = None
+
+    def stats(self) -> dict:
+        return {
+            "rendered": self.frames,
+            "displayed": self.displayed,
+            "dropped": self.dropped,
+            "buffers": len(self._rgba),
+        }
+
+
+# ----------------- Benchmark -----------------
+def _legacy_frame(frame):
+    """The previous path: BGR->RGB copy, PIL copy, then a resize like CTkImage does."""
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return Image.fromarray(rgb).resize(PREVIEW_SIZE)
+
+
+def _measure(label, step, frames):
+    """Average per-frame time and peak traced allocation while running `step(i)`."""
+    step(0)  # warm-up: first-use allocations are not per-frame cost
+    tracemalloc.start()
+    peaks = []
+    started = time.perf_counter()
+    baseline_start, _ = tracemalloc.get_traced_memory()
+    for i in range(frames):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        step(i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    elapsed = time.perf_counter() - started
+    growth = tracemalloc.get_traced_memory()[0] - baseline_start
+    tracemalloc.stop()
+
+    result = {
+        "path": label,
+        "ms_per_frame": round(elapsed * 1000.0 / frames, 3),
+        "alloc_kib_per_frame": round(sum(peaks) / len(peaks) / 1024.0, 1),
+        "max_alloc_kib": round(max(peaks) / 1024.0, 1),
+        "net_growth_kib": round(growth / 1024.0, 1),
+    }
+    print(f"[INFO] {result}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-frame allocations of the camera preview path.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--tk", action="store_true", help="also paste into a Tk PhotoImage (needs a display)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (args.height, args.width, 3), dtype=np.uint8) for _ in range(4)]
+    zone = detection_zone(args.width, args.height)
+
+    photo = None
+    if args.tk:
+        import tkinter as tk
+        from PIL import ImageTk
+        root = tk.Tk()
+        photo = ImageTk.PhotoImage(Image.new("RGBA", PREVIEW_SIZE))
+
+    def legacy(i):
+        image = _legacy_frame(frames[i % len(frames)])
+        if photo is not None:
+            # what CTkImage effectively did: a fresh PhotoImage per frame
+            ImageTk.PhotoImage(image)
+
+    renderer = PreviewRenderer()
+
+    def zero_copy(i):
+        renderer.render(frames[i % len(frames)], zone)
+        image = renderer.begin_display()
+        if photo is not None:
+            photo.paste(image)
+        renderer.end_display()
+
+    _measure("legacy", legacy, args.frames)
+    _measure("preview-renderer", zero_copy, args.frames)
+    if args.tk:
+        root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import os
+import json
+import glob
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+
+import speech_recognition as sr
+
+
+# ----------------- Recognizer Interface -----------------
+class RecognizerBackend:
+    """
+    Turns captured `sr.AudioData` into text. Implementations raise
+    `sr.UnknownValueError` when nothing intelligible was heard and
+    `sr.RequestError` when the engine itself is unavailable, matching
+    `recognize_google`, so the listen() retry logic stays unchanged.
+    """
+
+    name = "base"
+    # Backends that replay recorded audio also replace the microphone
+    provides_audio = False
+
+    def recognize(self, audio, language) -> str:
+        raise NotImplementedError
+
+    def next_audio(self):
+        raise NotImplementedError
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """Google Web Speech API (the kiosk's original recognizer)."""
+
+    name = "google"
+
+    def __init__(self):
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, audio, language) -> str:
+        return self._recognizer.recognize_google(audio, language=language)
+
+
+class OfflineRecognizer(RecognizerBackend):
+    """
+    Local Vosk models, one directory per language under `model_dir`
+    (e.g. models/en, models/hi, models/pa). Models load lazily and stay resident.
+    """
+
+    name = "offline"
+    sample_rate = 16000
+
+    def __init__(self, model_dir=None):
+        import vosk  # noqa: F401  (fail early if the engine is not installed)
+        self.model_dir = model_dir or os.getenv("VOSK_MODEL_DIR", os.path.join(os.getcwd(), "models"))
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, language):
+        import vosk
+
+        code = language.split("-")[0].lower()
+        with self._lock:
+            if code not in self._models:
+                path = os.path.join(self.model_dir, code)
+                if not os.path.isdir(path):
+                    raise sr.RequestError(f"no offline model for '{code}' in {self.model_dir}")
+                self._models[code] = vosk.Model(path)
+            return self._models[code]
+
+    def recognize(self, audio, language) -> str:
+        import vosk
+
+        recognizer = vosk.KaldiRecognizer(self._model(language), self.sample_rate)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class ReplayRecognizer(RecognizerBackend):
+    """
+    Feeds pre-recorded WAV fixtures instead of the microphone. Each `NN.wav` may
+    have an `NN.txt` transcript; without one the audio is passed to `inner`
+    (e.g. the offline recognizer) so real recognition can be benchmarked.
+    """
+
+    name = "replay"
+    provides_audio = True
+
+    def __init__(self, fixture_dir, inner=None, loop=False):
+        self.fixture_dir = fixture_dir
+        self.inner = inner
+        self.loop = loop
+        self.fixtures = sorted(glob.glob(os.path.join(fixture_dir, "*.wav")))
+        self._index = 0
+        self._transcripts = {}
+        self._lock = threading.Lock()
+        print(f"[INFO] Replaying {len(self.fixtures)} audio fixtures from {fixture_dir}.")
+
+    def next_audio(self):
+        with self._lock:
+            if self._index >= len(self.fixtures):
+                if not self.loop or not self.fixtures:
+                    raise sr.WaitTimeoutError("replay fixtures exhausted")
+                self._index = 0
+            path = self.fixtures[self._index]
+            self._index += 1
+
+        with sr.AudioFile(path) as source:
+            audio = sr.Recognizer().record(source)
+
+        transcript_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(transcript_path):
+            with open(transcript_path, "r", encoding="utf-8") as file:
+                self._transcripts[id(audio)] = file.read().strip()
+        return audio
+
+    def recognize(self, audio, language) -> str:
+        transcript = self._transcripts.pop(id(audio), None)
+        if transcript is not None:
+            if not transcript:
+                raise sr.UnknownValueError()
+            return transcript
+        if self.inner is None:
+            raise sr.UnknownValueError()
+        return self.inner.recognize(audio, language)
+
+
+class CombinedRecognizer(RecognizerBackend):
+    """
+    Runs several backends either one after another ("fallback") or all at once
+    ("race"), returning the first successful transcript.
+    """
+
+    def __init__(self, backends, mode="fallback", timeout=None):
+        self.backends = list(backends)
+        self.mode = mode
+        self.timeout = timeout
+        self.name = f"{mode}:" + ",".join(b.name for b in self.backends)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.backends)), thread_name_prefix="sr-backend")
+        self.wins = {b.name: 0 for b in self.backends}
+
+    def recognize(self, audio, language) -> str:
+        if self.mode == "race":
+            return self._race(audio, language)
+        return self._fallback(audio, language)
+
+    def _fallback(self, audio, language):
+        last_error = sr.UnknownValueError()
+        for backend in self.backends:
+            future = self._executor.submit(backend.recognize, audio, language)
+            try:
+                text = future.result(timeout=self.timeout)
+                self.wins[backend.name] += 1
+                return text
+            except FutureTimeoutError:
+                print(f"[WARN] {backend.name} recognizer timed out after {self.timeout}s.")
+                last_error = sr.RequestError(f"{backend.name} timed out")
+            except (sr.UnknownValueError, sr.RequestError) as e:
+                last_error = e
+        raise last_error
+
+    def _race(self, audio, language):
+        futures = {self._executor.submit(b.recognize, audio, language): b for b in self.backends}
+        last_error = sr.UnknownValueError()
+        try:
+            for future in as_completed(futures, timeout=self.timeout):
+                try:
+                    text = future.result()
+                except (sr.UnknownValueError, sr.RequestError) as e:
+                    last_error = e
+                    continue
+                self.wins[futures[future].name] += 1
+                return text
+        except FutureTimeoutError:
+            last_error = sr.RequestError(f"no recognizer answered within {self.timeout}s")
+        raise last_error
+
+
+# ----------------- Factory -----------------
+def _single(name):
+    if name == "google":
+        return GoogleRecognizer()
+    if name == "offline":
+        return OfflineRecognizer()
+    raise ValueError(f"unknown recognizer backend '{name}'")
+
+
+def create_recognizer(spec=None) -> RecognizerBackend:
+    """
+    Build a recognizer from `spec` (or SR_BACKEND):
+        google | offline
+        race:google,offline | fallback:google,offline
+        replay:<fixture_dir>[,<inner backend>]
+    """
+    spec = (spec or os.getenv("SR_BACKEND", "google")).strip()
+    timeout = os.getenv("SR_BACKEND_TIMEOUT")
+    timeout = float(timeout) if timeout else None
+
+    try:
+        if spec.startswith("replay:"):
+            fixture_dir, _, inner = spec[len("replay:"):].partition(",")
+            return ReplayRecognizer(fixture_dir, inner=_single(inner) if inner else None)
+        if ":" in spec:
+            mode, _, names = spec.partition(":")
+            backends = []
+            for name in names.split(","):
+                try:
+                    backends.append(_single(name.strip()))
+                except Exception as e:
+                    print(f"[WARN] Recognizer backend '{name}' unavailable: {e}")
+            if backends:
+                return CombinedRecognizer(backends, mode=mode, timeout=timeout)
+        else:
+            return _single(spec)
+    except Exception as e:
+        print(f"[WARN] Could not build recognizer '{spec}' ({e}); using Google.")
+    return GoogleRecognizer()
@@ -0,0 +1,214 @@
+import sys
+import time
+import asyncio
+import argparse
+
+from api_resilience import CircuitBreaker, RetryPolicy
+from async_api import AsyncAPIClient
+
+
+class _StubResponse:
+    def __init__(self, status_code, data=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.headers = headers or {}
+
+    def json(self):
+        return self._data
+
+
+class StubTransportClient(AsyncAPIClient):
+    """
+    AsyncAPIClient whose network is a script: `backend` is "up" or "down",
+    `health_delay` stalls /health. With `proxy`, it answers like cache_proxy.py
+    in front of that backend: searches named in `proxy_cached` are served
+    stale when it is down, and /health reports "degraded".
+    """
+
+    def __init__(self, breaker, proxy=False, **kwargs):
+        self.backend = "down"
+        self.health_delay = 0.0
+        self.health_calls = 0
+        self.proxy = proxy
+        self.proxy_cached = set()
+        super().__init__("http://stub/search", breaker=breaker, connect_timeout=0.1, read_timeout=0.2,
+                         retry=RetryPolicy(attempts=1, budget=0.3), **kwargs)
+
+    async def _send(self, method, url, params, read_timeout):
+        if method == "GET":
+            self.health_calls += 1
+            await asyncio.sleep(self.health_delay)
+            if self.backend == "up":
+                return _StubResponse(200, {"status": "ok"})
+            return _StubResponse(503, {"status": "degraded", "upstream": "down"} if self.proxy else None)
+        if not self.proxy:
+            if self.backend != "up":
+                raise ConnectionError("connection refused")
+            return _StubResponse(200, [{"case": 1}])
+        if self.backend == "up":
+            return _StubResponse(200, [{"case": 1}], {"X-Cache": "MISS"})
+        if params.get("cnr_number") in self.proxy_cached:
+            return _StubResponse(200, [{"case": 1}], {"X-Cache": "STALE-ERROR"})
+        return _StubResponse(502, {"detail": "backend unavailable"}, {"X-Cache": "ERROR"})
+
+
+# ----------------- Scenarios -----------------
+def _open_circuit(client):
+    for i in range(client.breaker.failure_threshold):
+        client.post("cnr", {"cnr_number": f"open-{i}"})
+    return client.breaker.state == CircuitBreaker.OPEN
+
+
+def scenario_cancelled_probe(reset):
+    """Stop pressed while the half-open /health probe is running: the breaker must not stay half_open."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset, probe_timeout=5.0)
+    client = StubTransportClient(breaker)
+    try:
+        assert _open_circuit(client), "circuit did not open"
+        time.sleep(reset)
+        client.backend = "up"
+        client.health_delay = 1.0
+        future = client.submit("cnr", {"cnr_number": "probe"})
+        time.sleep(0.1)
+        assert breaker.state == CircuitBreaker.HALF_OPEN, f"expected half_open, got {breaker.state}"
+        future.cancel()
+        time.sleep(0.1)
+        assert breaker.state == CircuitBreaker.OPEN, f"cancelled probe left the breaker {breaker.state}"
+
+        client.health_delay = 0.0
+        result = client.post("cnr", {"cnr_number": "after"})
+        assert result.get("status") == 200, f"search after a cancelled probe failed: {result}"
+        assert breaker.state == CircuitBreaker.CLOSED
+    finally:
+        client.close()
+
+
+def scenario_cancel_all_probe(reset):
+    """cancel_all() (stop_application) during the probe behaves like a single cancellation."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset, probe_timeout=5.0)
+    client = StubTransportClient(breaker)
+    try:
+        assert _open_circuit(client), "circuit did not open"
+        time.sleep(reset)
+        client.backend = "up"
+        client.health_delay = 1.0
+        client.submit("cnr", {"cnr_number": "probe"})
+        time.sleep(0.1)
+        client.cancel_all()
+        time.sleep(0.1)
+        assert breaker.state == CircuitBreaker.OPEN, f"cancel_all left the breaker {breaker.state}"
+    finally:
+        client.close()
+
+
+def scenario_lost_probe(reset):
+    """A probe that never reports back is replaced once `probe_timeout` has passed."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=reset, probe_timeout=0.5)
+    breaker.record_failure("test", now=0.0)
+    assert breaker.before_request(now=reset) == "probe"
+    assert breaker.before_request(now=reset + 0.1) == "reject"
+    assert breaker.before_request(now=reset + 0.6) == "probe", "lost probe was never replaced"
+    breaker.probe_result(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def scenario_failed_probe_backs_off(reset):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=reset, max_reset_seconds=reset * 4)
+    breaker.record_failure("test", now=0.0)
+    assert breaker.before_request(now=reset) == "probe"
+    breaker.probe_result(False, now=reset)
+    assert breaker.before_request(now=reset * 2) == "reject", "wait was not doubled"
+    assert breaker.before_request(now=reset * 3.5) == "probe"
+
+
+def scenario_speculation_ignored(reset):
+    """Wrong-guess prefetches failing must not open the circuit for the visitor's real search."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset)
+    client = StubTransportClient(breaker)
+    try:
+        futures = [client.submit("cnr", {"cnr_number": f"guess-{i}"}, speculative=True) for i in range(4)]
+        for future in futures:
+            future.result(2)
+        assert breaker.state == CircuitBreaker.CLOSED, f"speculations opened the circuit ({breaker.state})"
+
+        # a visitor joining a speculation in flight makes it count
+        speculation = client.submit("cnr", {"cnr_number": "joined"}, speculative=True)
+        client.post("cnr", {"cnr_number": "joined"})
+        speculation.result(2)
+        client.post("cnr", {"cnr_number": "real"})
+        assert breaker.state == CircuitBreaker.OPEN, f"real failures did not open the circuit ({breaker.state})"
+    finally:
+        client.close()
+
+
+def scenario_proxy_stale_ignored(reset):
+    """Stale answers from the cache proxy neither open nor close the circuit; its 502s do count."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset)
+    client = StubTransportClient(breaker, proxy=True)
+    client.proxy_cached = {"a", "b", "c"}
+    try:
+        for cnr in ("a", "b", "c"):
+            result = client.post("cnr", {"cnr_number": cnr})
+            assert result.get("status") == 200 and result.get("proxy") == "STALE-ERROR", result
+        assert breaker.state == CircuitBreaker.CLOSED, f"stale answers opened the circuit ({breaker.state})"
+
+        client.post("cnr", {"cnr_number": "x"})
+        client.post("cnr", {"cnr_number": "y"})
+        assert breaker.state == CircuitBreaker.OPEN, f"proxy 502s did not open the circuit ({breaker.state})"
+        result = client.post("cnr", {"cnr_number": "a"})
+        assert result.get("circuit") == "open", "a stale answer closed the circuit"
+    finally:
+        client.close()
+
+
+def scenario_degraded_probe(reset):
+    """The proxy's degraded /health (503) still lets traffic through, so stale answers reach the visitor."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=reset)
+    client = StubTransportClient(breaker, proxy=True)
+    client.proxy_cached = {"cached"}
+    try:
+        assert _open_circuit(client), "circuit did not open"
+        time.sleep(reset)
+        result = client.post("cnr", {"cnr_number": "cached"})
+        assert result.get("status") == 200, f"degraded proxy was not probed through: {result}"
+        assert breaker.state == CircuitBreaker.CLOSED, f"degraded probe left the breaker {breaker.state}"
+    finally:
+        client.close()
+
+
+SCENARIOS = {
+    "cancelled_probe": scenario_cancelled_probe,
+    "cancel_all_probe": scenario_cancel_all_probe,
+    "lost_probe": scenario_lost_probe,
+    "failed_probe_backs_off": scenario_failed_probe_backs_off,
+    "speculation_ignored": scenario_speculation_ignored,
+    "proxy_stale_ignored": scenario_proxy_stale_ignored,
+    "degraded_probe": scenario_degraded_probe,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exercise the search backend's circuit breaker against a stub transport.")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default=None, help="run one scenario (default: all)")
+    parser.add_argument("--reset-seconds", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    names = [args.scenario] if args.scenario else list(SCENARIOS)
+    failures = 0
+    for name in names:
+        try:
+            SCENARIOS[name](args.reset_seconds)
+            print(f"{name:<24} PASS")
+        except AssertionError as e:
+            failures += 1
+            print(f"{name:<24} FAIL  {e}")
+
+    if failures:
+        print(f"[ERROR] {failures} circuit breaker scenario(s) failed.")
+        return 1
+    print("[INFO] All circuit breaker scenarios passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
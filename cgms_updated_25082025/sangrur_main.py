@@ -1,14 +1,12 @@
 import os
 import json
-from gtts import gTTS
 import pygame
 import time
 import customtkinter as ctk
 from tkinter import messagebox
 from deep_translator import GoogleTranslator
 import speech_recognition as sr
-from PIL import Image
-import cv2
+from PIL import Image, ImageTk
 import threading
 import requests
 import re
@@ -22,35 +20,67 @@ import urllib.request
 from dotenv import load_dotenv
 import traceback
 import atexit
-import hashlib
+from translation_store import TranslationStore
+from api_cache import response_cache_from_env
+from async_api import AsyncAPIClient
+from api_resilience import retry_policy_from_env, circuit_breaker_from_env
+from prefetch import prefetch_engine_from_env
+from phrase_catalog import PhraseCatalog, DEFAULT_CATALOG_PATH
+from tts_cache import default_cache_dir, tts_cache_base, find_cached_audio, TTSCacheManager, write_metadata, load_metadata, word_timings
+from speech_synthesis import create_synthesizer
+from recognizers import create_recognizer
+from audio_capture import MicrophoneService
+from speech_stream import split_into_chunks, SpeechStream
+from frame_pipeline import LatestSlot, StageTimer
+from preview import PreviewRenderer, PREVIEW_SIZE
+from frame_sources import create_frame_source
+from detection_worker import DetectionProcess, detection_mode
+from presence import presence_tracker_from_env
+from vision import detection_zone, ZoneWatcher, capture_scheduler_from_env, MIN_FACE_SIZE, MAX_FACE_SIZE
+from face_detectors import create_face_detector
 
 # Load environment variables from .env file at the specified path
 load_dotenv(dotenv_path=r"C:\\Users\\admin\\Desktop\\Sangrur Court\\src_02\\.env")
 
 
+# Longest answer recorded in one turn, so a noisy lobby can never keep a turn open
+MAX_UTTERANCE_SECONDS = float(os.getenv("VAD_MAX_PHRASE_SECONDS", "15"))
+
+
 # #######################################################################################################
 class APIClient:
-    BASE_URL = "http://192.168.1.81:8000/search"
+    # Point API_BASE_URL at the court complex's cache proxy (cache_proxy.py) to share lookups across kiosks
+    BASE_URL = os.getenv("API_BASE_URL", "http://192.168.1.81:8000").rstrip("/") + "/search"
 
     def __init__(self):
         self.session = requests.Session()
+        # TTL cache with single-flight coalescing (API_CACHE=0 disables it)
+        self.cache = response_cache_from_env()
+        # Searches run on a background event loop so the UI keeps running during slow lookups.
+        # Failed attempts are retried within API_RETRY_BUDGET; the circuit breaker fails fast during outages.
+        self.async_client = AsyncAPIClient(
+            self.BASE_URL,
+            cache=self.cache,
+            connect_timeout=float(os.getenv("API_CONNECT_TIMEOUT", "2")),
+            read_timeout=float(os.getenv("API_READ_TIMEOUT", "6")),
+            retry=retry_policy_from_env(),
+            breaker=circuit_breaker_from_env(),
+            health_url=self.BASE_URL.replace("/search", "/health"),
+        )
+
+    def submit(self, endpoint: str, params: dict, speculative=False):
+        """Start a search and return its future without waiting."""
+        return self.async_client.submit(endpoint, params, speculative)
+
+    def cancel_pending(self) -> int:
+        return self.async_client.cancel_all()
+
+    def backend_available(self) -> bool:
+        return self.async_client.backend_available()
 
     def post(self, endpoint: str, params: dict):
-        url = f"{self.BASE_URL}/{endpoint}"
-        try:
-            response = self.session.post(
-                url,
-                headers={
-                    "accept": "application/json",
-                    "Content-Type": "application/json"
-                },
-                json=params,
-                timeout=10
-            )
-            response_data = response.json()
-            return {"status": response.status_code, "data": response_data}
-        except Exception as e:
-            return {"status": "error", "error": str(e)}
+        """Blocking search, with the same cache, retries and circuit breaker as `submit`."""
+        return self.async_client.post(endpoint, params)
         
     # ================================== Health Check ===================================================
     def check_backend(self) -> bool:
@@ -108,6 +138,8 @@ class HighCourt:
         self.auth_json_path = os.getenv("AUTH_JSON_PATH")
 
         self.client = APIClient()
+        # Speculative searches while the visitor is still answering (PREFETCH=0 disables)
+        self.prefetch = prefetch_engine_from_env(self.client)
         self.root = root
         self.root.attributes("-fullscreen", True)
         self.root.title("Court Case Information System")
@@ -129,12 +161,42 @@ class HighCourt:
 
         # Initialize caches for speed
         self._translators = {}
-        self._translate_cache = {}
-        self._tts_cache_dir = os.path.join(os.getcwd(), ".tts_cache")
+        self._translate_cache = TranslationStore(
+            os.getenv("TRANSLATION_CACHE_PATH", os.path.join(os.getcwd(), ".translation_cache.sqlite3")),
+            max_bytes=int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+        )
+        # Pre-built translations of the fixed prompts (see phrase_catalog.py)
+        self._phrase_catalog = PhraseCatalog(os.getenv("PHRASE_CATALOG_PATH", DEFAULT_CATALOG_PATH))
+        self._tts_cache_dir = default_cache_dir()
         try:
             os.makedirs(self._tts_cache_dir, exist_ok=True)
         except Exception:
             pass
+        self._tts_cache = TTSCacheManager(
+            self._tts_cache_dir,
+            max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+            max_age_days=float(os.getenv("TTS_CACHE_MAX_AGE_DAYS", "30"))
+        )
+        self._tts_cache.start()
+        # gTTS by default, falling back to the local engine when the network is slow (TTS_ENGINE)
+        self._synthesizer = create_synthesizer(on_late=self._store_late_tts)
+        # Google by default; offline, race/fallback and WAV replay via SR_BACKEND
+        self._recognizer = create_recognizer()
+        # One always-open microphone recorded into a ring buffer with VAD endpointing (not needed when replaying)
+        self._mic_service = None
+        self._fallback_recognizer = None
+        if not self._recognizer.provides_audio:
+            try:
+                self._mic_service = MicrophoneService(
+                    pre_roll=float(os.getenv("VAD_PRE_ROLL", "0.4")),
+                    pause_threshold=float(os.getenv("VAD_PAUSE_THRESHOLD", "0.8")),
+                    max_phrase_seconds=MAX_UTTERANCE_SECONDS,
+                    quiet_check=lambda: not (pygame.mixer.get_init() and pygame.mixer.music.get_busy())
+                )
+                self._mic_service.start()
+            except Exception as e:
+                print(f"[WARN] Could not open microphone service: {e}. Using a microphone per turn.")
+                self._mic_service = None
 
         # Initialize the reset_timer before any other method calls
         self.reset_timer = None
@@ -172,12 +234,19 @@ class HighCourt:
         self.heading_label.pack(fill="x", pady=10)
 
         # Face detection variables
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        # Backend from FACE_DETECTOR: haar (default), yunet, ssd or null; loaded where detection runs
+        self.face_detector = None
         self.cap = None
         self.is_camera_running = False
         self.detection_thread = None
+        self.capture_thread = None
+        self.render_thread = None
+        self._detection_process = None
+        self._detection_restarts = 0
+        self._detection_started_at = 0.0
         self.face_detected = False
-        self.face_detection_cooldown = False
+        # Single owner of the "greet this visitor" decision (hysteresis + dwell, one session per visitor)
+        self.presence = presence_tracker_from_env()
         
         # Create frame for camera feed
         self.image_frame = ctk.CTkFrame(
@@ -195,8 +264,8 @@ class HighCourt:
         self.image_label = ctk.CTkLabel(self.image_frame, text="", width=940, height=490)
         self.image_label.pack(padx=5, pady=5)
 
-        # keep a strong ref to the current CTkImage to prevent GC issues
-        self._current_ctk_frame_image = None
+        # single persistent PhotoImage for the preview (created with the first frame)
+        self._preview_photo = None
         
         self.start_camera()
 
@@ -564,7 +633,6 @@ class HighCourt:
             self.speak_pause = False
             self.conversation_pause = False
             self.listen_pause = False
-        self.face_detection_cooldown = False
 
          # ======================= Safe close password popup =======================
         if hasattr(self, "password_window"):
@@ -599,78 +667,191 @@ class HighCourt:
 
     # ========================================= face detection ==========================================    
     def start_camera(self):
-        """Start the camera and face detection thread"""
+        """Start face detection: a worker process by default, or the in-process thread pipeline"""
         self.on_action_performed()
-        self.cap = cv2.VideoCapture(0)  # 0 is usually the built-in webcam
         self.is_camera_running = True
-        
-        # Start detection in a separate thread
-        self.detection_thread = threading.Thread(target=self.detect_faces)
-        self.detection_thread.daemon = True
+
+        if detection_mode() == "process" and self._start_detection_process():
+            return
+        self._start_thread_pipeline()
+
+    def _start_detection_process(self) -> bool:
+        """Spawn the detection worker and start polling it; False if it could not be started."""
+        try:
+            self._detection_process = DetectionProcess(PREVIEW_SIZE)
+            self._detection_process.start()
+            self._detection_started_at = time.time()
+            self.root.after(0, self._poll_detection_process)
+            return True
+        except Exception as e:
+            print(f"[WARN] Could not start the detection process ({e}); detecting in-process.")
+            self._detection_process = None
+            return False
+
+    def _on_detection_process_exit(self):
+        """The worker died at runtime: respawn it with backoff, then fall back to in-process detection."""
+        worker, self._detection_process = self._detection_process, None
+        try:
+            worker.stop()
+        except Exception:
+            pass
+        # A worker that ran for a while before dying starts a fresh series of restarts
+        if time.time() - self._detection_started_at > 60:
+            self._detection_restarts = 0
+        self._detection_restarts += 1
+
+        if self._detection_restarts > 3:
+            print("[ERROR] Detection process keeps exiting; detecting in-process instead.")
+            self._start_thread_pipeline()
+            return
+        delay = 2 ** self._detection_restarts
+        print(f"[WARN] Detection process exited; restarting it in {delay}s (attempt {self._detection_restarts}).")
+
+        def restart():
+            if self.is_camera_running and self._detection_process is None and not self._start_detection_process():
+                self._start_thread_pipeline()
+
+        self.root.after(delay * 1000, restart)
+
+    def _start_thread_pipeline(self):
+        """In-process capture, detect and render threads."""
+        # CAMERA_SOURCE: device:0 (the built-in webcam) by default, or a video / image / synthetic replay
+        self.cap = create_frame_source()
+
+        self.face_detector = create_face_detector(min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE)
+        print(f"[INFO] Face detector: {self.face_detector.name}")
+        self.capture_scheduler = capture_scheduler_from_env()
+
+        # Latest-frame-wins hand-offs: capture -> detect, capture -> render -> Tk
+        self._detect_slot = LatestSlot("detect")
+        self._render_slot = LatestSlot("render")
+        self._preview = PreviewRenderer(PREVIEW_SIZE)
+        self._ui_pending = False
+        self._stage_timers = {name: StageTimer(name) for name in ("capture", "detect", "render", "ui")}
+
+        self.capture_thread = threading.Thread(target=self._capture_frames, name="camera-capture", daemon=True)
+        self.detection_thread = threading.Thread(target=self.detect_faces, name="face-detect", daemon=True)
+        self.render_thread = threading.Thread(target=self._render_frames, name="camera-render", daemon=True)
+        self.capture_thread.start()
         self.detection_thread.start()
+        self.render_thread.start()
+
+    def _update_presence(self, face_in_zone):
+        """Feed the presence tracker; True when a new visitor should be greeted."""
+        # A running conversation (camera_pause) holds presence instead of a cooldown flag
+        self.presence.set_held(self.camera_pause)
+        for name, _ in self.presence.update(face_in_zone):
+            if name == "session_start":
+                print("[INFO] Visitor detected; starting a session.")
+                self.face_detected = True
+                return True
+        return False
 
-    def detect_faces(self):
-        """Thread function for face detection with strict zone and no bounding boxes."""
-        self.on_action_performed()
-        last_detection_time = 0
-        cooldown_period = 10
-        min_face_size = (160, 160)
-        max_face_size = (250, 250)
-        
+    def _poll_detection_process(self):
+        """Tk main thread: forward the pause state, act on presence, show the newest preview."""
+        worker = self._detection_process
+        if worker is None or not self.is_camera_running:
+            return
+        try:
+            worker.set_paused(self.camera_pause)
+            worker.poll()
+            if self._update_presence(worker.person_present):
+                # Not inline: the conversation blocks, and polling must go on meanwhile
+                self.root.after(0, self._face_button_conversation)
+
+            pil_img = worker.claim_frame()
+            if pil_img is not None:
+                self._update_camera_image(pil_img)
+
+            if not worker.alive:
+                self._on_detection_process_exit()
+                return
+        except Exception as e:
+            print(f"[ERROR] Detection process poll failed: {e}")
+        self.root.after(40, self._poll_detection_process)
+
+    def _capture_frames(self):
+        """Capture stage: read frames at the scheduler's pace and publish them to detect and render."""
         while self.is_camera_running:
-            ret, frame = self.cap.read()
+            self.capture_scheduler.set_conversation(self.camera_pause)
+            with self._stage_timers["capture"]:
+                ret, frame = self.cap.read()
             if not ret:
                 time.sleep(0.1)
                 continue
 
-            # Convert frame to RGB for GUI
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            # Both stages only read the frame, so they can share it
+            self._detect_slot.put(frame)
+            self._render_slot.put(frame)
+            self.capture_scheduler.wait()
 
-            # Draw detection zone regardless of detection pause
-            height, width = frame.shape[:2]
-            x_start = int(width * 0.3)
-            x_end = int(width * 0.7)
-            y_start = int(height * 0.2)
-            y_end = int(height * 0.8)
-            cv2.rectangle(frame_rgb, (x_start, y_start), (x_end, y_end), (0, 255, 0), 2)
-            cv2.putText(frame_rgb, "Detection Range", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            cv2.putText(frame_rgb, f"Min: {min_face_size[0]}px", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 200, 0), 2)
-            cv2.putText(frame_rgb, f"Max: {max_face_size[0]}px", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 200, 0), 2)
+    def detect_faces(self):
+        """Detection stage: strict zone, no bounding boxes, always on the newest frame."""
+        self.on_action_performed()
+        # Motion gate, then full detector every Nth frame with template tracking in between
+        self.zone_watcher = ZoneWatcher(self.face_detector.detect, self.capture_scheduler)
+        
+        while self.is_camera_running:
+            frame = self._detect_slot.get(timeout=0.5)
+            if frame is None:
+                continue
 
             # Only do face detection if not paused
             if not self.camera_pause:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                faces = self.face_cascade.detectMultiScale(
-                    gray,
-                    scaleFactor=1.1,
-                    minNeighbors=4,
-                    minSize=min_face_size,
-                    maxSize=max_face_size
-                )
+                with self._stage_timers["detect"]:
+                    faces = self.zone_watcher.faces(frame)
 
-                face_in_zone = False
-                current_time = time.time()
+                face_in_zone = len(faces) > 0  # Only need one full face inside zone
+                if self._update_presence(face_in_zone):
+                    self.root.after(0, self._face_button_conversation)
+            else:
+                self.zone_watcher.pause()
+                self.presence.set_held(True)
 
-                for (x, y, w, h) in faces:
-                    # Check if face is completely within detection zone
-                    if (x >= x_start and x + w <= x_end and
-                        y >= y_start and y + h <= y_end):
-                        face_in_zone = True
-                        break  # Only need one full face inside zone
+    def _render_frames(self):
+        """Render stage: resize, convert and annotate into reused buffers off the Tk thread."""
+        zone_box = None
+        zone_shape = None
 
-                if face_in_zone and not self.face_detection_cooldown and (current_time - last_detection_time > cooldown_period):
-                    self.face_detected = True
-                    last_detection_time = current_time
-                    self.face_detection_cooldown = True
-                    self.root.after(0, self._face_button_conversation)
+        while self.is_camera_running:
+            frame = self._render_slot.get(timeout=0.5)
+            if frame is None:
+                continue
 
-            # Always update the GUI image (create the CTkImage on the MAIN thread)
-            pil_img = Image.fromarray(frame_rgb)
+            with self._stage_timers["render"]:
+                # Draw detection zone regardless of detection pause
+                if frame.shape != zone_shape:
+                    zone_shape = frame.shape
+                    zone_box = detection_zone(zone_shape[1], zone_shape[0])
+                self._preview.render(frame, zone_box)
 
-            # Create & set CTkImage on the Tk main thread to avoid "image" errors.
-            self.root.after(0, lambda img=pil_img: self._update_camera_image(img))
+            # At most one callback queued on Tk; it always shows the newest frame
+            if not self._ui_pending:
+                self._ui_pending = True
+                try:
+                    self.root.after(0, self._show_latest_frame)
+                except Exception:
+                    self._ui_pending = False
 
-            time.sleep(0.03)
+    def _show_latest_frame(self):
+        """UI stage (Tk main thread): paste whichever frame is newest when Tk gets to it."""
+        self._ui_pending = False
+        pil_img = self._preview.begin_display()
+        if pil_img is None:
+            return
+        try:
+            with self._stage_timers["ui"]:
+                self._update_camera_image(pil_img)
+        finally:
+            self._preview.end_display()
+
+    def camera_pipeline_stats(self) -> dict:
+        """Per-stage processing time and per-slot drops (backpressure)."""
+        return {
+            "stages": {name: timer.stats() for name, timer in self._stage_timers.items()},
+            "slots": {slot.name: slot.stats() for slot in (self._detect_slot, self._render_slot)},
+            "preview": self._preview.stats(),
+        }
     
     # ===================================================================================================
 
@@ -684,8 +865,9 @@ class HighCourt:
         except Exception:
             pass
         try:
-            if self.detection_thread and self.detection_thread.is_alive():
-                self.detection_thread.join(timeout=1.0)
+            for thread in (self.capture_thread, self.detection_thread, self.render_thread):
+                if thread and thread.is_alive():
+                    thread.join(timeout=1.0)
         except Exception:
             pass
         try:
@@ -699,6 +881,39 @@ class HighCourt:
                 pygame.mixer.quit()
         except Exception:
             pass
+        try:
+            print(f"[INFO] Translation cache stats: {self._translate_cache.stats()}")
+            self._translate_cache.close()
+        except Exception:
+            pass
+        try:
+            print(f"[INFO] Presence stats: {self.presence.stats()}")
+            if self.client.cache is not None:
+                print(f"[INFO] API cache stats: {self.client.cache.stats()}")
+            print(f"[INFO] Async API stats: {self.client.async_client.stats()}")
+            if self.prefetch is not None:
+                print(f"[INFO] Prefetch stats: {self.prefetch.stats()}")
+            self.client.async_client.close()
+            if self._detection_process is not None:
+                self._detection_process.stop()
+                print(f"[INFO] Detection process stats: {self._detection_process.stats()}")
+            if getattr(self, "zone_watcher", None) is not None:
+                print(f"[INFO] Face detection stats: {self.zone_watcher.stats()}")
+            if getattr(self, "capture_scheduler", None) is not None:
+                print(f"[INFO] Camera scheduler stats: {self.capture_scheduler.stats()}")
+                print(f"[INFO] Camera pipeline stats: {self.camera_pipeline_stats()}")
+        except Exception:
+            pass
+        try:
+            print(f"[INFO] TTS cache stats: {self._tts_cache.stats()}")
+            self._tts_cache.stop()
+        except Exception:
+            pass
+        try:
+            if self._mic_service is not None:
+                self._mic_service.stop()
+        except Exception:
+            pass
         try:
             self.root.destroy()
         except Exception:
@@ -857,11 +1072,15 @@ class HighCourt:
         
         # Set all pause flags to True to stop operations
         self.stop_system = True
+        if self.prefetch is not None:
+            self.prefetch.cancel()
+        cancelled = self.client.cancel_pending()
+        if cancelled:
+            print(f"[INFO] Cancelled {cancelled} pending search(es).")
         self.camera_pause = True
         self.speak_pause = True
         self.conversation_pause = True
         self.listen_pause = True
-        self.face_detection_cooldown = True
         
         # Stop any ongoing audio playback immediately (do not quit mixer to avoid re-init cost)
         if pygame.mixer.get_init():
@@ -1025,18 +1244,22 @@ class HighCourt:
         
         self.camera_pause = True
         
-        key = (source, target, text)
-        if key in self._translate_cache:
-            return self._translate_cache[key]
+        # Fixed prompts come from the offline catalog; only dynamic text goes to the translator
+        catalog_hit = self._phrase_catalog.lookup(text, source, target)
+        if catalog_hit is not None:
+            return catalog_hit
+
+        cached = self._translate_cache.get(text, source, target)
+        if cached is not None:
+            return cached
 
         st_key = (source, target)
         if st_key not in self._translators:
             self._translators[st_key] = GoogleTranslator(source=source, target=target)
         try:
             translated = self._translators[st_key].translate(text)
-            # cache result for speed
-            if len(text) <= 4000:  # avoid caching huge strings
-                self._translate_cache[key] = translated
+            # persist result for speed across restarts (huge strings are skipped by the store)
+            self._translate_cache.put(text, source, target, translated)
             return translated
         except Exception as e:
             print(f"Translation error: {e}")
@@ -1052,77 +1275,136 @@ class HighCourt:
         self.listen_pause = True
         
         try:
-            # Use cached TTS audio if available to avoid network delay
-            key_bytes = (lang + "\0" + text).encode("utf-8", errors="ignore")
-            tts_hash = hashlib.sha1(key_bytes).hexdigest()
-            cached_mp3 = os.path.join(self._tts_cache_dir, f"{lang}_{tts_hash}.mp3")
-
-            if not os.path.exists(cached_mp3):
-                # Generate the speech file using gTTS
-                tts = gTTS(text=text, lang=lang)
-                tts.save(cached_mp3)
-
-            # Initialize pygame mixer if not already initialized
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-
-            # Load the speech file into pygame mixer
-            pygame.mixer.music.load(cached_mp3)
-            pygame.mixer.music.play()  # Play the audio
-
-            # Calculate the total duration of the audio
-            audio = pygame.mixer.Sound(cached_mp3)
-            total_duration = audio.get_length()
-
-            # Split the text into words for real-time display
-            words = text.split()
-            num_words = len(words)
-            duration_per_word = total_duration / max(num_words, 1)  # Avoid division by zero
-
-            # Clear the subtitle label before starting
-            if self.root and self.subtitle_label.winfo_exists():
-                self.subtitle_label.configure(text="", text_color="gray")
-                self.root.update()
+            chunks = split_into_chunks(text)
+            whole_cached = find_cached_audio(self._tts_cache_dir, lang, text) is not None
 
-            # Start time for tracking word display
-            start_time = time.time()
-
-            # Display words in real-time as the audio plays
-            for idx, word in enumerate(words):
-                # 🔹 Check if speaking was paused/stopped OR audio stopped
-                if self.speak_pause or self.stop_system or not pygame.mixer.music.get_busy():
-                    self.subtitle_label.configure(text="", text_color="gray")
-                    self.root.update()
+            if whole_cached or len(chunks) <= 1:
+                cached_mp3, metadata = self._synthesize_cached(text, lang)
+                if not self._play_with_subtitles(cached_mp3, text, metadata):
                     return
-                
+            else:
+                # Long readouts (e.g. several cases): chunk 1 plays while later chunks are still being synthesized
+                stream = SpeechStream(chunks, lang, self._synthesize_cached)
+                try:
+                    while True:
+                        if self.speak_pause or self.stop_system:
+                            self._clear_subtitle()
+                            return
+                        try:
+                            item = stream.next_ready()
+                        except StopIteration:
+                            break
+                        if item is None:
+                            self.root.update()
+                            continue
+
+                        chunk, cached_mp3, metadata = item
+                        if not self._play_with_subtitles(cached_mp3, chunk, metadata):
+                            return
+                finally:
+                    stream.cancel()
+
+            # Keep mixer initialized to avoid re-init overhead
+            self.listen_pause = False
+
+        except Exception as e:
+            print(f"Text-to-speech error: {e}")
+
+    def _synthesize_cached(self, text, lang):
+        """Return (cached_audio, metadata) for the text, synthesizing it on a cache miss."""
+        # Use cached TTS audio if available to avoid network delay (primed via `tts_cache.py prime`)
+        cached_mp3 = find_cached_audio(self._tts_cache_dir, lang, text)
+
+        if cached_mp3 is None:
+            # Generate the speech file with the configured engine
+            self._tts_cache.record_miss()
+            cached_mp3 = self._synthesizer.synthesize(text, lang, tts_cache_base(self._tts_cache_dir, lang, text))
+            metadata = write_metadata(cached_mp3, text)
+            # offline stand-in audio is played once but never cached
+            if not self._synthesizer.is_temporary(cached_mp3):
+                self._tts_cache.record_store(cached_mp3)
+        else:
+            metadata = load_metadata(cached_mp3, text)
+            self._tts_cache.record_hit(cached_mp3)
+
+        return cached_mp3, metadata
+
+    def _store_late_tts(self, path, text, lang):
+        """A slow gTTS job finished after the fallback was played: index and account its file."""
+        write_metadata(path, text)
+        self._tts_cache.record_store(path, playing=False)
+
+    def _clear_subtitle(self):
+        self.subtitle_label.configure(text="", text_color="gray")
+        self.root.update()
+
+    def _play_with_subtitles(self, cached_mp3, text, metadata):
+        """Play one audio file while revealing its words. Returns False if playback was interrupted."""
+        # Initialize pygame mixer if not already initialized
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+        # Load the speech file into pygame mixer
+        pygame.mixer.music.load(cached_mp3)
+        pygame.mixer.music.play()  # Play the audio
+
+        # Word timings come from the sidecar index, so the file is decoded only once (by the mixer)
+        words = text.split()
+        timings = metadata["word_timings"]
+        if not metadata["duration"]:
+            # headers unreadable: fall back to decoding once to learn the length
+            timings = word_timings(text, pygame.mixer.Sound(cached_mp3).get_length())
+
+        # Clear the subtitle label before starting
+        if self.root and self.subtitle_label.winfo_exists():
+            self.subtitle_label.configure(text="", text_color="gray")
+            self.root.update()
+
+        # Start time for tracking word display
+        start_time = time.time()
+
+        # Display words in real-time as the audio plays
+        for idx, word in enumerate(words):
+            # 🔹 Check if speaking was paused/stopped
+            if self.speak_pause or self.stop_system:
+                self._clear_subtitle()
+                return False
+
+            # 🔹 Audio ended a little ahead of the word timings: show the rest and carry on
+            if not pygame.mixer.music.get_busy():
                 if self.root and self.subtitle_label.winfo_exists():
                     current_text = self.subtitle_label.cget("text")
+                    remaining = " ".join(words[idx:])
                     self.subtitle_label.configure(
-                        text=(current_text + " " + word) if current_text else word, 
+                        text=(current_text + " " + remaining) if current_text else remaining,
                         text_color="gray"
                     )
                     self.root.update()
+                break
+            
+            if self.root and self.subtitle_label.winfo_exists():
+                current_text = self.subtitle_label.cget("text")
+                self.subtitle_label.configure(
+                    text=(current_text + " " + word) if current_text else word, 
+                    text_color="gray"
+                )
+                self.root.update()
 
-                # Calculate the elapsed time and sleep accordingly
-                elapsed_time = time.time() - start_time
-                expected_time = duration_per_word * (idx + 1)
-                sleep_time = max(0, expected_time - elapsed_time)
-                time.sleep(sleep_time)
-
-            # 🔹 Final wait loop
-            while pygame.mixer.music.get_busy():
-                if self.speak_pause or self.stop_system:
-                    self.subtitle_label.configure(text="", text_color="gray")
-                    self.root.update()
-                    pygame.mixer.music.stop()  # make sure audio halts
-                    return
-                pygame.time.Clock().tick(30)  # smoother UI
-
-            # Keep mixer initialized to avoid re-init overhead
-            self.listen_pause = False
+            # Calculate the elapsed time and sleep accordingly
+            elapsed_time = time.time() - start_time
+            expected_time = timings[idx][1] if idx < len(timings) else 0
+            sleep_time = max(0, expected_time - elapsed_time)
+            time.sleep(sleep_time)
+
+        # 🔹 Final wait loop
+        while pygame.mixer.music.get_busy():
+            if self.speak_pause or self.stop_system:
+                self._clear_subtitle()
+                pygame.mixer.music.stop()  # make sure audio halts
+                return False
+            pygame.time.Clock().tick(30)  # smoother UI
 
-        except Exception as e:
-            print(f"Text-to-speech error: {e}")
+        return True
 
     def listen(self, lang="pa", timeout=7):
         self.on_action_performed(timer=60.0)
@@ -1131,7 +1413,6 @@ class HighCourt:
             return
 
         self.camera_pause = True
-        recognizer = sr.Recognizer()
 
         attempts = 0
         max_attempts = 3
@@ -1140,37 +1421,55 @@ class HighCourt:
             if self.stop_system:
                 break
 
-            with sr.Microphone() as source:
-                try:
-                    # shorter calibration to be faster
-                    recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                    self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
-                    self.root.update()
-                    audio = recognizer.listen(source, timeout=timeout)
-                    recognized_text = recognizer.recognize_google(audio, language='en')
-                    winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
-                    return recognized_text
-
-                except sr.UnknownValueError:
-                    attempts += 1
-                    error_message = self.translate_text(text="Could not understand audio. Retrying...", source='en', target=lang)
-                    self.speak_text(text=error_message, lang=lang)
-
-                except sr.RequestError as e:
-                    attempts += 1
-                    error_message = self.translate_text(text=f"Request error: {e}. Retrying...", source='en', target=lang)
-                    self.speak_text(text=error_message, lang=lang)
+            try:
+                # shorter calibration to be faster
+                audio = self._capture_utterance(timeout=timeout, calibration=0.3)
+                recognized_text = self._recognizer.recognize(audio, language='en')
+                winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
+                return recognized_text
+
+            except sr.UnknownValueError:
+                attempts += 1
+                error_message = self.translate_text(text="Could not understand audio. Retrying...", source='en', target=lang)
+                self.speak_text(text=error_message, lang=lang)
+
+            except sr.RequestError as e:
+                attempts += 1
+                error_message = self.translate_text(text=f"Request error: {e}. Retrying...", source='en', target=lang)
+                self.speak_text(text=error_message, lang=lang)
 
-                except Exception as e:
-                    attempts += 1
-                    error_message = self.translate_text(text=f"An error occurred: {e}. Retrying...", source='en', target=lang)
-                    self.speak_text(text=error_message, lang=lang)
+            except Exception as e:
+                attempts += 1
+                error_message = self.translate_text(text=f"An error occurred: {e}. Retrying...", source='en', target=lang)
+                self.speak_text(text=error_message, lang=lang)
 
 
         final_error_message = self.translate_text(text="Failed to listen after all attempts.", source='en', target=lang)
         self.speak_text(text=final_error_message, lang=lang)
         return ""
     
+    def _capture_utterance(self, timeout, calibration):
+        """Record one utterance from the microphone, or the next fixture when replaying."""
+        if self._recognizer.provides_audio:
+            self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
+            self.root.update()
+            return self._recognizer.next_audio()
+
+        # Stream is always recording; the utterance is cut out of the ring buffer
+        if self._mic_service is not None and self._mic_service.running:
+            self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
+            self.root.update()
+            return self._mic_service.listen(timeout=timeout, phrase_time_limit=MAX_UTTERANCE_SECONDS)
+
+        if self._fallback_recognizer is None:
+            self._fallback_recognizer = sr.Recognizer()
+        recognizer = self._fallback_recognizer
+        with sr.Microphone() as source:
+            recognizer.adjust_for_ambient_noise(source, duration=calibration)
+            self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
+            self.root.update()
+            return recognizer.listen(source, timeout=timeout, phrase_time_limit=MAX_UTTERANCE_SECONDS)
+    
     # ===================================================================================================
 
     # ======================================= listen case id ============================================
@@ -1214,80 +1513,75 @@ class HighCourt:
             return
 
         self.camera_pause = True
-        recognizer = sr.Recognizer()
         attempts = 0
         max_attempts = 3
 
         while attempts < max_attempts:
-            with sr.Microphone() as source:
-                try:
-                    # winsound.PlaySound(self.start_sound, winsound.SND_FILENAME)
-                    recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                    self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
-                    self.root.update()
-                    audio = recognizer.listen(source, timeout=timeout)
-                    recognized_text = recognizer.recognize_google(audio, language=lang)
-                    print(f"Recognized case number: {recognized_text}")
-
-                    recognized_text = self._map_spoken_numbers(recognized_text, lang)
-                    recognized_text = recognized_text.replace("O", "0").replace("o", "0")
-                    recognized_text = recognized_text.replace(" ", "-")
-                    winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
-
-                    parts = recognized_text.split("-")
-                    numeric_part = ""
-                    alphanumeric_part = ""
-
-                    for part in parts:
-                        if part.isdigit():
-                            numeric_part = part
-                        else:
-                            alphanumeric_part = part.upper()
-
-                    if not numeric_part:
-                        print(f"Invalid case number: {recognized_text}. Numeric part is missing.")
-                        error_message = self.translate_text(text="Invalid case number. Numeric part is missing.", source='en', target=lang)
-                        self.speak_text(text=error_message, lang=lang)
-                        attempts += 1
-                        continue
-
-                    structured_case_number = f"{numeric_part}-{alphanumeric_part}" if alphanumeric_part else numeric_part
-
-                    if re.match(r'^\d+(-\w+)?$', structured_case_number):
-                        return structured_case_number
+            try:
+                # winsound.PlaySound(self.start_sound, winsound.SND_FILENAME)
+                audio = self._capture_utterance(timeout=timeout, calibration=0.8)
+                recognized_text = self._recognizer.recognize(audio, language=lang)
+                print(f"Recognized case number: {recognized_text}")
+
+                recognized_text = self._map_spoken_numbers(recognized_text, lang)
+                recognized_text = recognized_text.replace("O", "0").replace("o", "0")
+                recognized_text = recognized_text.replace(" ", "-")
+                winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
+
+                parts = recognized_text.split("-")
+                numeric_part = ""
+                alphanumeric_part = ""
+
+                for part in parts:
+                    if part.isdigit():
+                        numeric_part = part
                     else:
-                        print(f"Invalid case number: {structured_case_number}. Case number must be in the format 'XXXX-XXX' or 'XXXX'.")
-                        error_message = self.translate_text(
-                            text="Invalid case number format. It should be like '1234' or '1234-ABC'.", source='en', target=lang
-                        )
-                        self.speak_text(text=error_message, lang=lang)
-                        attempts += 1
-                        continue
-
-                except sr.UnknownValueError:
-                    attempts += 1
-                    error_message = self.translate_text(text="Sorry, I could not understand the audio. Retrying...", source='en', target=lang)
-                    self.speak_text(text=error_message, lang=lang)
+                        alphanumeric_part = part.upper()
 
-                except sr.RequestError as e:
-                    attempts += 1
-                    error_message = self.translate_text(
-                        text=f"Could not request results from the speech recognition service; {e}. Retrying...",
-                        source='en', target=lang
-                    )
+                if not numeric_part:
+                    print(f"Invalid case number: {recognized_text}. Numeric part is missing.")
+                    error_message = self.translate_text(text="Invalid case number. Numeric part is missing.", source='en', target=lang)
                     self.speak_text(text=error_message, lang=lang)
-
-                except Exception as e:
                     attempts += 1
+                    continue
+
+                structured_case_number = f"{numeric_part}-{alphanumeric_part}" if alphanumeric_part else numeric_part
+
+                if re.match(r'^\d+(-\w+)?$', structured_case_number):
+                    return structured_case_number
+                else:
+                    print(f"Invalid case number: {structured_case_number}. Case number must be in the format 'XXXX-XXX' or 'XXXX'.")
                     error_message = self.translate_text(
-                        text=f"An error occurred in listen_case_number: {e}. Retrying...",
-                        source='en', target=lang
+                        text="Invalid case number format. It should be like '1234' or '1234-ABC'.", source='en', target=lang
                     )
                     self.speak_text(text=error_message, lang=lang)
+                    attempts += 1
+                    continue
+
+            except sr.UnknownValueError:
+                attempts += 1
+                error_message = self.translate_text(text="Sorry, I could not understand the audio. Retrying...", source='en', target=lang)
+                self.speak_text(text=error_message, lang=lang)
+
+            except sr.RequestError as e:
+                attempts += 1
+                error_message = self.translate_text(
+                    text=f"Could not request results from the speech recognition service; {e}. Retrying...",
+                    source='en', target=lang
+                )
+                self.speak_text(text=error_message, lang=lang)
+
+            except Exception as e:
+                attempts += 1
+                error_message = self.translate_text(
+                    text=f"An error occurred in listen_case_number: {e}. Retrying...",
+                    source='en', target=lang
+                )
+                self.speak_text(text=error_message, lang=lang)
                 
-                finally:
-                    if self.stop_system:
-                        break
+            finally:
+                if self.stop_system:
+                    break
 
 
         # If all attempts fail
@@ -1304,59 +1598,54 @@ class HighCourt:
             return
 
         self.camera_pause = True
-        recognizer = sr.Recognizer()
         attempts = 0
         max_attempts = 3
 
         while attempts < max_attempts:
-            with sr.Microphone() as source:
-                try:
-                    # winsound.PlaySound(self.start_sound, winsound.SND_FILENAME)
-                    recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                    self.subtitle_label.configure(text="🎙️ MIC INPUT", text_color="blue")
-                    self.root.update()
-                    audio = recognizer.listen(source, timeout=timeout)
-                    recognized_text = recognizer.recognize_google(audio, language=lang)
-
-                    recognized_text = self._map_spoken_numbers(recognized_text, lang)
-                    recognized_text = recognized_text.replace("O", "0").replace("o", "0")
-                    winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
+            try:
+                # winsound.PlaySound(self.start_sound, winsound.SND_FILENAME)
+                audio = self._capture_utterance(timeout=timeout, calibration=0.8)
+                recognized_text = self._recognizer.recognize(audio, language=lang)
 
-                    if recognized_text.isdigit() and len(recognized_text) == 4:
-                        return recognized_text
-                    else:
-                        translated_text = self.translate_text(
-                            text=f"Invalid case year: {recognized_text}. Case year must be a 4-digit number.",
-                            source='en', target=lang
-                        )
-                        self.speak_text(text=translated_text, lang=lang)
-                        return None
-
-                except sr.UnknownValueError:
-                    attempts += 1
-                    error_message = self.translate_text(
-                        text="Sorry, I could not understand the audio. Retrying...", source='en', target=lang
-                    )
-                    self.speak_text(text=error_message, lang=lang)
+                recognized_text = self._map_spoken_numbers(recognized_text, lang)
+                recognized_text = recognized_text.replace("O", "0").replace("o", "0")
+                winsound.PlaySound(self.end_sound, winsound.SND_FILENAME)
 
-                except sr.RequestError as e:
-                    attempts += 1
-                    error_message = self.translate_text(
-                        text=f"Could not request results from the speech recognition service; {e}. Retrying...",
+                if recognized_text.isdigit() and len(recognized_text) == 4:
+                    return recognized_text
+                else:
+                    translated_text = self.translate_text(
+                        text=f"Invalid case year: {recognized_text}. Case year must be a 4-digit number.",
                         source='en', target=lang
                     )
-                    self.speak_text(text=error_message, lang=lang)
+                    self.speak_text(text=translated_text, lang=lang)
+                    return None
 
-                except Exception as e:
-                    attempts += 1
-                    error_message = self.translate_text(
-                        text=f"An error occurred: {e}. Retrying...", source='en', target=lang
-                    )
-                    self.speak_text(text=error_message, lang=lang)
+            except sr.UnknownValueError:
+                attempts += 1
+                error_message = self.translate_text(
+                    text="Sorry, I could not understand the audio. Retrying...", source='en', target=lang
+                )
+                self.speak_text(text=error_message, lang=lang)
+
+            except sr.RequestError as e:
+                attempts += 1
+                error_message = self.translate_text(
+                    text=f"Could not request results from the speech recognition service; {e}. Retrying...",
+                    source='en', target=lang
+                )
+                self.speak_text(text=error_message, lang=lang)
+
+            except Exception as e:
+                attempts += 1
+                error_message = self.translate_text(
+                    text=f"An error occurred: {e}. Retrying...", source='en', target=lang
+                )
+                self.speak_text(text=error_message, lang=lang)
                 
-                finally:
-                    if self.stop_system:
-                        break
+            finally:
+                if self.stop_system:
+                    break
 
         # If all attempts fail
         final_error = self.translate_text(
@@ -1420,6 +1709,46 @@ class HighCourt:
 
         self.conversation(lang=lang, input_from_button=input_from_button)
     
+    def _speculate(self, endpoint, known, field):
+        """Prefetch `endpoint` for the likely values of `field` while the visitor is asked for it."""
+        if self.prefetch is not None and not self.stop_system:
+            self.prefetch.speculate(endpoint, known, field)
+
+    def _search(self, endpoint, params, lang="pa"):
+        """
+        Run a backend search without freezing the UI. Answers that are not back
+        almost at once (cache hits are) get "searching, please wait" spoken while
+        the request runs. Stop/reset (stop_system) cancels the request.
+        """
+        if self.prefetch is not None:
+            outcome = self.prefetch.resolve(endpoint, params)
+            self.prefetch.learn(endpoint, params)
+            if outcome != "none":
+                print(f"[INFO] Prefetch for '{endpoint}': {outcome}")
+
+        future = self.client.submit(endpoint, params)
+        announce_at = time.time() + 0.3
+        announced = False
+
+        while not future.done():
+            if self.stop_system:
+                future.cancel()
+                break
+            if not announced and time.time() >= announce_at:
+                announced = True
+                self.speak_text(self.translate_text("Searching, please wait.", source='en', target=lang), lang=lang)
+                continue
+            self.root.update()
+            time.sleep(0.02)
+
+        if future.cancelled():
+            print(f"[INFO] Search '{endpoint}' cancelled.")
+            return {"status": "cancelled", "error": "search cancelled"}
+        try:
+            return future.result()
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
     def conversation(self, lang="pa", input_from_button=False):
         """Engage in a conversation based on user input."""
         self.on_action_performed(timer=90.0)
@@ -1930,7 +2259,7 @@ class HighCourt:
                             self.text_input.insert(0, str(cnr_number))
 
                             # Make POST request using APIClient instance
-                            response = self.client.post("cnr", {"cnr_number": cnr_number})
+                            response = self._search("cnr", {"cnr_number": cnr_number}, lang=lang)
 
                             # === Handle API errors ===
                             if response.get("status") != 200:
@@ -1969,10 +2298,10 @@ class HighCourt:
                             self.text_input.insert(0, str(year))
 
                             # Step 3: Make API Call
-                            response = self.client.post("filing", {
+                            response = self._search("filing", {
                                 "filing_number": filing_number,
                                 "year": year
-                            })
+                            }, lang=lang)
 
                             # Step 4: Handle Non-200 Response
                             if response.get("status") != 200:
@@ -2007,6 +2336,7 @@ class HighCourt:
                             registration_number = self.listen(lang=lang).upper().replace(" ", "/")
                             self.text_input.delete(0, ctk.END)
                             self.text_input.insert(0, str(registration_number))
+                            self._speculate("registration", {"case_type": case_type, "registration_number": registration_number}, "year")
 
                             # Step 3: Ask for Year
                             translated_text = self.translate_text("Please speak Year.", source='en', target=lang)
@@ -2016,11 +2346,11 @@ class HighCourt:
                             self.text_input.insert(0, str(year))
 
                             # Step 4: Make API Call
-                            response = self.client.post("registration", {
+                            response = self._search("registration", {
                                 "case_type": case_type,
                                 "registration_number": registration_number,
                                 "year": year
-                            })
+                            }, lang=lang)
 
                             # Step 5: Handle API Failure
                             if response.get("status") != 200:
@@ -2077,6 +2407,14 @@ class HighCourt:
                             self.text_input.delete(0, ctk.END)
                             self.text_input.insert(0, str(year))
 
+                            self._speculate("fir", {
+                                "state": state,
+                                "district": district,
+                                "police_station": police_station,
+                                "fir_number": fir_number,
+                                "year": year
+                            }, "status")
+
                             # Step 6: Case Status
                             translated_text = self.translate_text("Please speak case status.", source='en', target=lang)
                             self.speak_text(translated_text, lang=lang)
@@ -2085,14 +2423,14 @@ class HighCourt:
                             self.text_input.insert(0, str(status))
 
                             # Step 7: API Call
-                            response = self.client.post("fir", {
+                            response = self._search("fir", {
                                 "state": state,
                                 "district": district,
                                 "police_station": police_station,
                                 "fir_number": fir_number,
                                 "year": year,
                                 "status": status
-                            })
+                            }, lang=lang)
 
                             # Step 8: API Error Handling
                             if response.get("status") != 200:
@@ -2130,6 +2468,7 @@ class HighCourt:
 
                             # Combine both
                             party_name = f"{petitioner_name} vs {respondent_name}"
+                            self._speculate("party", {"petitioner_respondent": party_name}, "status")
 
                             # Step 3: Case Status
                             translated_text = self.translate_text("Please speak case status.", source='en', target=lang)
@@ -2139,10 +2478,10 @@ class HighCourt:
                             self.text_input.insert(0, str(status))
 
                             # Step 4: API Call
-                            response = self.client.post("party", {
+                            response = self._search("party", {
                                 "petitioner_respondent": party_name,
                                 "status": status
-                            })
+                            }, lang=lang)
 
                             # Step 5: Error Handling
                             if response.get("status") != 200:
@@ -2189,12 +2528,12 @@ class HighCourt:
                             self.text_input.insert(0, str(judge_name))
 
                             # Step 5: API Call
-                            response = self.client.post("subordinate", {
+                            response = self._search("subordinate", {
                                 "state": state,
                                 "district": district,
                                 "subordinate_court_name": court_name,
                                 "judge_name": judge_name
-                            })
+                            }, lang=lang)
 
                             # Step 6: Error Handling
                             if response.get("status") != 200:
@@ -2239,10 +2578,10 @@ class HighCourt:
                 self.text_input.insert(0, str(status))
 
                 # Step 3: API Call
-                response = self.client.post("advocate", {
+                response = self._search("advocate", {
                     "advocate_name": advocate_name,
                     "status": status
-                })
+                }, lang=lang)
 
                 # Step 4: Error Handling
                 if response.get("status") != 200:
@@ -2267,6 +2606,7 @@ class HighCourt:
             elif any(word in self.search_type for word in ['3', 'three', 'teen', 'तीन', 'ਤਿੰਨ', 'cause list', 'कारण सूची', 'ਕਾਰਨ ਸੂਚੀ']):
                 # Step 1: Get Court Name from Selected Establishment
                 court_name = self.court_establishment.title()
+                self._speculate("cause_list", {"court_name": court_name}, "court_type")
 
                 # Step 2: Ask Court Type
                 translated_text = self.translate_text("Please speak case type.", source='en', target=lang)
@@ -2276,10 +2616,10 @@ class HighCourt:
                 self.text_input.insert(0, str(court_type))
 
                 # Step 3: API Call
-                response = self.client.post("cause_list", {
+                response = self._search("cause_list", {
                     "court_name": court_name,
                     "court_type": court_type
-                })
+                }, lang=lang)
 
                 # Step 4: Handle Invalid HTTP Response
                 if response.get("status") != 200:
@@ -2325,11 +2665,11 @@ class HighCourt:
                 self.text_input.insert(0, str(panel))
                 
                 # Step 4: API Call
-                response = self.client.post("lokadalat", {
+                response = self._search("lokadalat", {
                     "status": status,
                     "lokadalat": lokadalat,
                     "panel": panel
-                })
+                }, lang=lang)
 
                 # Step 5: Error & Empty Handling
                 if response.get("status") != 200:
@@ -2372,11 +2712,11 @@ class HighCourt:
                 self.text_input.insert(0, caveatee_name)
                 
                 # Step 4: Make API Call
-                response = self.client.post("caveat", {
+                response = self._search("caveat", {
                     "caveat_type": caveat_type,
                     "caveator_name": caveator_name,
                     "caveatee_name": caveatee_name
-                })
+                }, lang=lang)
 
                 # Step 5: Response Handling
                 if response.get("status") != 200:
@@ -2422,12 +2762,12 @@ class HighCourt:
                 self.text_input.insert(0, year)
 
                 # Step 5: Send Data to API
-                response = self.client.post("pre_panel", {
+                response = self._search("pre_panel", {
                     "police_station": police_station,
                     "fir_type": fir_type,
                     "fir_number": fir_number,
                     "year": year
-                })
+                }, lang=lang)
 
                 # Step 6: Handle Response
                 if response.get("status") != 200:
@@ -2482,14 +2822,16 @@ class HighCourt:
     # =============================== helpers added for robustness & performance ========================
     def _update_camera_image(self, pil_img: Image.Image):
         """
-        Create CTkImage and update the label on the MAIN thread.
-        Keeps a strong reference to prevent Tk image GC issues.
+        Paste the frame into one persistent PhotoImage on the MAIN thread.
+        The label is configured once; later frames only update the image in place.
         """
         try:
-            ctk_img = ctk.CTkImage(light_image=pil_img, size=(920, 460))
-            self._current_ctk_frame_image = ctk_img  # keep a reference!
-            self.image_label.configure(image=ctk_img)
-            self.image_label.image = ctk_img
+            if self._preview_photo is None:
+                self._preview_photo = ImageTk.PhotoImage(pil_img)
+                self.image_label.configure(image=self._preview_photo)
+                self.image_label.image = self._preview_photo  # keep a reference!
+            else:
+                self._preview_photo.paste(pil_img)
         except Exception as e:
             print(f"[ERROR] Could not update camera frame in UI: {e}")
 
@@ -2507,6 +2849,12 @@ class HighCourt:
             if pygame.mixer.get_init():
                 pygame.mixer.music.stop()
                 pygame.mixer.quit()
+            self._translate_cache.close()
+            if self._mic_service is not None:
+                self._mic_service.stop()
+            if self._detection_process is not None:
+                self._detection_process.stop()
+            self.client.async_client.close()
         except Exception:
             pass
 
@@ -0,0 +1,114 @@
+import re
+import queue
+import threading
+
+# Sentence enders for English, Hindi and Punjabi (danda) plus explicit line breaks
+_SENTENCE_END = re.compile(r"(?<=[.!?।॥])\s+|\n+")
+_CASE_HEADER = re.compile(r"={3,}")
+
+
+def split_into_chunks(text, max_chars=220, first_max_chars=90) -> list:
+    """
+    Split a readout into speakable chunks: case blocks first, then sentences/lines,
+    merged back up to `max_chars`. The first chunk is kept short so playback can
+    start as soon as possible.
+    """
+    if not text or not text.strip():
+        return []
+
+    # Each "========== Case N Details ==========" header starts a new block
+    blocks = []
+    for line in text.splitlines():
+        if _CASE_HEADER.search(line) or not blocks:
+            blocks.append([])
+        blocks[-1].append(line)
+
+    chunks = []
+    for block in blocks:
+        sentences = [s.strip() for s in _SENTENCE_END.split("\n".join(block)) if s and s.strip()]
+        current = ""
+        for sentence in sentences:
+            limit = first_max_chars if not chunks else max_chars
+            if current and len(current) + 1 + len(sentence) > limit:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+
+    return chunks
+
+
+# ----------------- Streaming Synthesis -----------------
+class SpeechStream:
+    """
+    Synthesizes chunks on a producer thread while the caller plays earlier ones.
+
+    `synthesize(chunk, lang)` must return (audio_path, metadata). `next_ready()`
+    hands back (chunk, audio_path, metadata) in order and only blocks briefly,
+    so the Tk main loop and the stop/pause flags keep being serviced.
+    """
+
+    _DONE = object()
+
+    def __init__(self, chunks, lang, synthesize, lookahead=3):
+        self.chunks = list(chunks)
+        self.lang = lang
+        self._synthesize = synthesize
+        self._ready = queue.Queue(maxsize=max(1, lookahead))
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="tts-stream", daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        for chunk in self.chunks:
+            if self._cancelled.is_set():
+                break
+            try:
+                item = (chunk, *self._synthesize(chunk, self.lang))
+            except Exception as e:
+                print(f"[WARN] Streaming synthesis failed for chunk {chunk[:40]!r}: {e}")
+                continue
+            while not self._cancelled.is_set():
+                try:
+                    self._ready.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        self._put_done()
+
+    def _put_done(self):
+        while True:
+            try:
+                self._ready.put(self._DONE, timeout=0.1)
+                return
+            except queue.Full:
+                if self._cancelled.is_set():
+                    return
+
+    def next_ready(self, timeout=0.05):
+        """
+        Return the next synthesized (chunk, path, metadata), None if it is not
+        ready yet, or raise StopIteration once the stream is exhausted.
+        """
+        try:
+            item = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if item is self._DONE:
+            raise StopIteration
+        return item
+
+    def cancel(self):
+        """Stop producing further chunks; already-synthesized files stay cached."""
+        self._cancelled.set()
+        try:
+            while True:
+                self._ready.get_nowait()
+        except queue.Empty:
+            pass
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
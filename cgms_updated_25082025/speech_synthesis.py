@@ -0,0 +1,237 @@
+import os
+import re
+import wave
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+# ----------------- Synthesizer Interface -----------------
+class SpeechSynthesizer:
+    """
+    Turns text into an audio file. `synthesize()` receives the cache path without
+    an extension and returns the full path it wrote (base_path + extension).
+    """
+
+    name = "base"
+    extension = ".mp3"
+
+    def synthesize(self, text, lang, base_path) -> str:
+        raise NotImplementedError
+
+    def is_temporary(self, path) -> bool:
+        """True when `path` is a stand-in that must not be kept in the cache."""
+        return False
+
+    @staticmethod
+    def _commit(tmp_path, final_path):
+        # write-then-rename so a reader never sees a half-written file
+        os.replace(tmp_path, final_path)
+        return final_path
+
+
+class GTTSSynthesizer(SpeechSynthesizer):
+    """Google Text-to-Speech over the network (the kiosk's original engine)."""
+
+    name = "gtts"
+    extension = ".mp3"
+
+    def synthesize(self, text, lang, base_path) -> str:
+        from gtts import gTTS
+
+        final_path = base_path + self.extension
+        tmp_path = final_path + ".tmp"
+        gTTS(text=text, lang=lang).save(tmp_path)
+        return self._commit(tmp_path, final_path)
+
+
+class OfflineSynthesizer(SpeechSynthesizer):
+    """Local engine via pyttsx3 (SAPI5 on Windows, eSpeak on Linux); works without the uplink."""
+
+    name = "offline"
+    extension = ".wav"
+
+    def __init__(self, rate=None):
+        import pyttsx3  # noqa: F401  (fail early if the engine is not installed)
+        self.rate = rate
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _language_tags(voice):
+        """Language codes a voice advertises, e.g. {'en-us', 'tts', ...} from SAPI ids or eSpeak 'gmw/en'."""
+        tags = set(re.split(r"[\\/\s]+", str(voice.id).lower()))
+        # SAPI ids join fields with '_' (TTS_MS_EN-US_ZIRA_11.0)
+        tags.update(part for tag in list(tags) for part in tag.split("_"))
+        for code in getattr(voice, "languages", None) or []:
+            code = code.decode("utf-8", "ignore") if isinstance(code, bytes) else str(code)
+            # eSpeak prefixes each language with a priority byte
+            tags.add("".join(ch for ch in code if ch.isprintable()).strip().lower())
+        return tags
+
+    @classmethod
+    def _pick_voice(cls, engine, lang):
+        lang = lang.lower()
+        for voice in engine.getProperty("voices") or []:
+            # exact codes only: a substring match took "pa" for "spanish" and "en" for "tokens"
+            if any(tag == lang or tag.startswith((lang + "-", lang + "_")) for tag in cls._language_tags(voice)):
+                return voice.id
+        return None
+
+    def synthesize(self, text, lang, base_path) -> str:
+        import pyttsx3
+
+        final_path = base_path + self.extension
+        tmp_path = base_path + ".offline.tmp"
+        # pyttsx3 engines are not thread-safe
+        with self._lock:
+            engine = pyttsx3.init()
+            try:
+                voice_id = self._pick_voice(engine, lang)
+                if voice_id:
+                    engine.setProperty("voice", voice_id)
+                if self.rate:
+                    engine.setProperty("rate", self.rate)
+                engine.save_to_file(text, tmp_path)
+                engine.runAndWait()
+            finally:
+                engine.stop()
+        return self._commit(tmp_path, final_path)
+
+
+class NullSynthesizer(SpeechSynthesizer):
+    """
+    Deterministic backend for tests and benchmarks: writes a silent WAV whose
+    length is computed from the word count, with no network or audio device.
+    """
+
+    name = "null"
+    extension = ".wav"
+
+    def __init__(self, seconds_per_word=0.35, lead_seconds=0.2, sample_rate=16000):
+        self.seconds_per_word = seconds_per_word
+        self.lead_seconds = lead_seconds
+        self.sample_rate = sample_rate
+
+    def duration_for(self, text) -> float:
+        return self.lead_seconds + self.seconds_per_word * len(text.split())
+
+    def synthesize(self, text, lang, base_path) -> str:
+        final_path = base_path + self.extension
+        tmp_path = base_path + ".null.tmp"
+        frames = int(self.duration_for(text) * self.sample_rate)
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\x00\x00" * frames)
+        return self._commit(tmp_path, final_path)
+
+
+class FallbackSynthesizer(SpeechSynthesizer):
+    """
+    Tries the primary engine and switches to the fallback when it fails or does
+    not finish within `timeout` seconds. A slow primary keeps running in the
+    background, so its (better) file lands in the cache for the next replay;
+    `on_late(path, text, lang)` is called once it has.
+
+    Fallback audio is only a stand-in: it is written under `scratch_dir`, never
+    to the cache path, so the next replay tries the primary again.
+
+    At most `max_late` such slow jobs are kept. While that many are still
+    running (e.g. during a gTTS outage), the primary is skipped and the
+    fallback answers at once, so late jobs never pile up.
+    """
+
+    name = "auto"
+
+    def __init__(self, primary, fallback, timeout=4.0, max_late=1, scratch_dir=None, on_late=None):
+        self.primary = primary
+        self.fallback = fallback
+        self.timeout = timeout
+        self.max_late = max_late
+        self.extension = primary.extension
+        self.scratch_dir = scratch_dir or os.path.join(tempfile.gettempdir(), "kiosk_tts_fallback")
+        self.on_late = on_late
+        self._executor = ThreadPoolExecutor(max_workers=max_late + 1, thread_name_prefix="tts-primary")
+        self._late = set()
+        self._lock = threading.Lock()
+        self.primary_ok = 0
+        self.late_ok = 0
+        self.fallbacks = 0
+        self.skipped = 0
+
+    def is_temporary(self, path) -> bool:
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.scratch_dir)
+
+    def _scratch_base(self, base_path) -> str:
+        os.makedirs(self.scratch_dir, exist_ok=True)
+        return os.path.join(self.scratch_dir, os.path.basename(base_path))
+
+    def _late_done(self, future, text, lang, base_path):
+        with self._lock:
+            self._late.discard(future)
+        if future.cancelled() or future.exception() is not None:
+            return
+        path = future.result()
+        self.late_ok += 1
+        # the stand-in is superseded; one still open in the mixer is overwritten next time instead
+        try:
+            os.remove(self._scratch_base(base_path) + self.fallback.extension)
+        except OSError:
+            pass
+        if self.on_late is not None:
+            try:
+                self.on_late(path, text, lang)
+            except Exception as e:
+                print(f"[WARN] Late {self.primary.name} audio callback failed: {e}")
+
+    def _use_fallback(self, text, lang, base_path) -> str:
+        self.fallbacks += 1
+        return self.fallback.synthesize(text, lang, self._scratch_base(base_path))
+
+    def synthesize(self, text, lang, base_path) -> str:
+        with self._lock:
+            stuck = len(self._late) >= self.max_late
+        if stuck:
+            self.skipped += 1
+            return self._use_fallback(text, lang, base_path)
+
+        future = self._executor.submit(self.primary.synthesize, text, lang, base_path)
+        try:
+            path = future.result(timeout=self.timeout)
+            self.primary_ok += 1
+            return path
+        except FutureTimeoutError:
+            print(f"[WARN] {self.primary.name} synthesis slower than {self.timeout}s, using {self.fallback.name}.")
+            with self._lock:
+                self._late.add(future)
+            future.add_done_callback(lambda done: self._late_done(done, text, lang, base_path))
+        except Exception as e:
+            print(f"[WARN] {self.primary.name} synthesis failed ({e}), using {self.fallback.name}.")
+        return self._use_fallback(text, lang, base_path)
+
+
+# ----------------- Factory -----------------
+def create_synthesizer(engine=None, fallback_timeout=None, on_late=None) -> SpeechSynthesizer:
+    """
+    Build the engine named by `engine` (or TTS_ENGINE): gtts, offline, null or
+    auto (gtts with automatic offline fallback when pyttsx3 is installed).
+    `on_late` is passed to the auto engine's FallbackSynthesizer.
+    """
+    engine = (engine or os.getenv("TTS_ENGINE", "auto")).lower()
+    if fallback_timeout is None:
+        fallback_timeout = float(os.getenv("TTS_FALLBACK_TIMEOUT", "4.0"))
+
+    if engine == "gtts":
+        return GTTSSynthesizer()
+    if engine == "offline":
+        return OfflineSynthesizer()
+    if engine == "null":
+        return NullSynthesizer()
+
+    try:
+        fallback = OfflineSynthesizer()
+    except Exception as e:
+        print(f"[INFO] Offline TTS engine unavailable ({e}); using gTTS without fallback.")
+        return GTTSSynthesizer()
+    return FallbackSynthesizer(GTTSSynthesizer(), fallback, timeout=fallback_timeout, on_late=on_late)
@@ -0,0 +1,182 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+# ----------------- Translation Store -----------------
+class TranslationStore:
+    """
+    Disk-backed, size-bounded translation cache shared across kiosk restarts.
+
+    Entries live in a SQLite file keyed by (source, target, sha1(text)) and are
+    evicted least-recently-used first once the stored text exceeds `max_bytes`.
+    A small in-memory front answers warm prompts without touching the disk.
+    """
+
+    def __init__(self, path, max_bytes=8 * 1024 * 1024, max_memory_entries=512, max_text_len=4000):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_memory_entries = max_memory_entries
+        self.max_text_len = max_text_len
+
+        self._lock = threading.RLock()
+        self._memory = OrderedDict()
+        self._pending_touch = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = self._connect(path)
+        self._total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM translations"
+        ).fetchone()[0]
+
+    def _connect(self, path):
+        try:
+            folder = os.path.dirname(os.path.abspath(path))
+            os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            print(f"[WARN] Translation cache at {path} unavailable ({e}). Using memory only.")
+            conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                key        TEXT PRIMARY KEY,
+                source     TEXT NOT NULL,
+                target     TEXT NOT NULL,
+                translated TEXT NOT NULL,
+                size       INTEGER NOT NULL,
+                last_used  REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)")
+        return conn
+
+    @staticmethod
+    def make_key(text, source, target):
+        text_hash = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+        return f"{source}:{target}:{text_hash}"
+
+    # ================================== Lookup / Store ==================================
+    def get(self, text, source, target):
+        """Return the cached translation or None."""
+        key = self.make_key(text, source, target)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._pending_touch[key] = time.time()
+                self.hits += 1
+                return self._memory[key]
+
+            try:
+                row = self._conn.execute(
+                    "SELECT translated FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[WARN] Translation cache read failed: {e}")
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._remember(key, row[0])
+            self._pending_touch[key] = time.time()
+            if len(self._pending_touch) >= 64:
+                self._flush_touches()
+            return row[0]
+
+    def put(self, text, source, target, translated):
+        """Store a translation, evicting old entries to stay within the byte budget."""
+        if translated is None or len(text) > self.max_text_len:
+            return
+
+        key = self.make_key(text, source, target)
+        size = len(text.encode("utf-8", errors="ignore")) + len(translated.encode("utf-8", errors="ignore"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            try:
+                old = self._conn.execute("SELECT size FROM translations WHERE key = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO translations (key, source, target, translated, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, source, target, translated, size, time.time()),
+                )
+                self._total_bytes += size - (old[0] if old else 0)
+                self._pending_touch.pop(key, None)
+                self._flush_touches()
+                self._evict()
+            except sqlite3.Error as e:
+                print(f"[WARN] Translation cache write failed: {e}")
+            self._remember(key, translated)
+
+    def _remember(self, key, translated):
+        self._memory[key] = translated
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touches(self):
+        if not self._pending_touch:
+            return
+        try:
+            self._conn.executemany(
+                "UPDATE translations SET last_used = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._pending_touch.items()],
+            )
+        except sqlite3.Error as e:
+            print(f"[WARN] Translation cache touch failed: {e}")
+        self._pending_touch.clear()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM translations ORDER BY last_used ASC LIMIT 32"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+            victims = []
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                victims.append((key,))
+                self._total_bytes -= size
+                self._memory.pop(key, None)
+                self.evictions += 1
+            self._conn.executemany("DELETE FROM translations WHERE key = ?", victims)
+
+    # ================================== Housekeeping ===================================
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "entries": entries,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_touches()
+                self._conn.close()
+            except Exception:
+                pass
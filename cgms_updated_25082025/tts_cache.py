@@ -0,0 +1,394 @@
+import os
+import sys
+import json
+import time
+import wave
+import hashlib
+import argparse
+import datetime
+import threading
+
+from phrase_catalog import PhraseCatalog, DEFAULT_CATALOG_PATH, CATALOG_LANGUAGES
+from speech_synthesis import create_synthesizer
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def default_cache_dir() -> str:
+    return os.getenv("TTS_CACHE_DIR", os.path.join(os.getcwd(), ".tts_cache"))
+
+
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+
+
+def tts_cache_base(cache_dir, lang, text) -> str:
+    """Cache path for (lang, text) without the extension, which depends on the engine."""
+    key_bytes = (lang + "\0" + text).encode("utf-8", errors="ignore")
+    tts_hash = hashlib.sha1(key_bytes).hexdigest()
+    return os.path.join(cache_dir, f"{lang}_{tts_hash}")
+
+
+def tts_cache_path(cache_dir, lang, text, extension=".mp3") -> str:
+    """Path of the cached audio for (lang, text); shared by speak_text and the prime command."""
+    return tts_cache_base(cache_dir, lang, text) + extension
+
+
+def find_cached_audio(cache_dir, lang, text):
+    """Return the cached audio file for (lang, text), preferring network MP3 over offline WAV."""
+    base = tts_cache_base(cache_dir, lang, text)
+    for extension in AUDIO_EXTENSIONS:
+        if os.path.exists(base + extension):
+            return base + extension
+    return None
+
+
+def audio_duration(path) -> float:
+    """Read the duration from the file headers without decoding the audio."""
+    return read_audio_info(path)["duration"]
+
+
+def read_audio_info(path) -> dict:
+    """Duration, sample rate and channel count taken from the file headers only."""
+    info = {"duration": 0.0, "sample_rate": None, "channels": None}
+    try:
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as wav:
+                info["sample_rate"] = wav.getframerate()
+                info["channels"] = wav.getnchannels()
+                info["duration"] = wav.getnframes() / float(wav.getframerate() or 1)
+            return info
+
+        from mutagen.mp3 import MP3
+        header = MP3(path).info
+        info["duration"] = float(header.length)
+        info["sample_rate"] = getattr(header, "sample_rate", None)
+        info["channels"] = getattr(header, "channels", None)
+    except Exception as e:
+        print(f"[WARN] Could not read audio headers of {path}: {e}")
+    return info
+
+
+# ----------------- Metadata Sidecars -----------------
+METADATA_VERSION = 1
+METADATA_SUFFIX = ".meta.json"
+
+
+def metadata_path(audio_path) -> str:
+    return audio_path + METADATA_SUFFIX
+
+
+def word_timings(text, duration) -> list:
+    """Split the duration across words in proportion to their length; returns [start, end] pairs."""
+    words = text.split()
+    weights = [len(word) + 1 for word in words]
+    total = sum(weights) or 1
+    timings = []
+    start = 0.0
+    for weight in weights:
+        end = start + duration * weight / total
+        timings.append([round(start, 3), round(end, 3)])
+        start = end
+    return timings
+
+
+def write_metadata(audio_path, text) -> dict:
+    """Index a freshly synthesized file so playback never has to decode it to learn its length."""
+    info = read_audio_info(audio_path)
+    metadata = {
+        "version": METADATA_VERSION,
+        "text_sha1": hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest(),
+        "duration": round(info["duration"], 3),
+        "sample_rate": info["sample_rate"],
+        "channels": info["channels"],
+        "words": len(text.split()),
+        "word_timings": word_timings(text, info["duration"]),
+    }
+    try:
+        tmp_path = metadata_path(audio_path) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(metadata, file)
+        os.replace(tmp_path, metadata_path(audio_path))
+    except OSError as e:
+        print(f"[WARN] Could not write audio metadata for {audio_path}: {e}")
+    return metadata
+
+
+def load_metadata(audio_path, text) -> dict:
+    """Read the sidecar for a cached file, rebuilding it from the headers if missing or stale."""
+    text_sha1 = hashlib.sha1(text.encode("utf-8", errors="ignore")).hexdigest()
+    try:
+        with open(metadata_path(audio_path), "r", encoding="utf-8") as file:
+            metadata = json.load(file)
+        if metadata.get("version") == METADATA_VERSION and metadata.get("text_sha1") == text_sha1:
+            return metadata
+    except (OSError, ValueError):
+        pass
+    return write_metadata(audio_path, text)
+
+
+# ----------------- Audio Bank Prime -----------------
+def static_prompts(catalog_path=DEFAULT_CATALOG_PATH, languages=CATALOG_LANGUAGES):
+    """Yield (lang, english_text, spoken_text) for every fixed prompt in every language."""
+    catalog = PhraseCatalog(catalog_path)
+    for english, entry in sorted(catalog.phrases.items()):
+        for lang in languages:
+            spoken = entry.get(lang)
+            if spoken:
+                yield lang, english, spoken
+
+
+def prime_audio_bank(cache_dir=None, catalog_path=DEFAULT_CATALOG_PATH, languages=CATALOG_LANGUAGES, synthesize=True, engine="gtts"):
+    """
+    Synthesize every fixed prompt ahead of time and write the audio-bank manifest.
+    With synthesize=False only reports how many prompts are still uncached.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    synthesizer = create_synthesizer(engine) if synthesize else None
+
+    entries = []
+    cached = generated = failed = missing = 0
+    for lang, english, spoken in static_prompts(catalog_path, languages):
+        path = find_cached_audio(cache_dir, lang, spoken)
+
+        if path is not None:
+            cached += 1
+        elif not synthesize:
+            missing += 1
+            continue
+        else:
+            try:
+                path = synthesizer.synthesize(spoken, lang, tts_cache_base(cache_dir, lang, spoken))
+                if synthesizer.is_temporary(path):
+                    raise RuntimeError("only fallback audio was produced")
+                generated += 1
+            except Exception as e:
+                failed += 1
+                print(f"[WARN] Could not synthesize {lang}: {english[:60]!r} ({e})")
+                continue
+
+        metadata = load_metadata(path, spoken)
+        entries.append({
+            "lang": lang,
+            "source_text": english,
+            "text": spoken,
+            "file": os.path.basename(path),
+            "duration": metadata["duration"],
+            "words": metadata["words"],
+        })
+
+    total = cached + generated + failed + missing
+    uncached = failed + missing
+    print(f"[INFO] Audio bank: {total} prompts, {cached} already cached, {generated} generated, {uncached} still uncached.")
+
+    if synthesize:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "built_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "languages": list(languages),
+            "entries": entries,
+        }
+        manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+        print(f"[INFO] Wrote audio bank manifest to {manifest_path}.")
+
+    return {"total": total, "cached": cached, "generated": generated, "uncached": uncached}
+
+
+# ----------------- Cache Manager -----------------
+class TTSCacheManager:
+    """
+    Keeps `.tts_cache` within a byte quota and an age limit.
+
+    Files are ranked by last play (their mtime is bumped on every hit), prompts
+    listed in the audio-bank manifest are pinned, and compaction runs on a
+    background thread so speak_text never waits on the disk scan.
+    """
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024, max_age_days=30, compact_interval=300.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        self.compact_interval = compact_interval
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._active_path = None
+        self._approx_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_reclaimed = 0
+        self.files_evicted = 0
+        self.last_compaction = None
+
+        self.pinned = self._load_pinned()
+
+    def _load_pinned(self) -> set:
+        pinned = {MANIFEST_NAME}
+        try:
+            with open(os.path.join(self.cache_dir, MANIFEST_NAME), "r", encoding="utf-8") as file:
+                for entry in json.load(file).get("entries", []):
+                    pinned.add(entry["file"])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[WARN] Could not read audio bank manifest: {e}")
+        return pinned
+
+    # ================================== Accounting =====================================
+    def record_hit(self, path):
+        """Count a cache hit and mark the file as just played."""
+        with self._lock:
+            self.hits += 1
+            self._active_path = path
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def record_store(self, path, playing=True):
+        """Account a freshly synthesized file and wake the compactor if over quota."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        with self._lock:
+            if playing:
+                self._active_path = path
+            self._approx_bytes += size
+            over_quota = self._approx_bytes > self.max_bytes
+        if over_quota:
+            self._wakeup.set()
+
+    # ================================== Compaction =====================================
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="tts-cache-compactor", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"[WARN] TTS cache compaction failed: {e}")
+            self._wakeup.wait(self.compact_interval)
+            self._wakeup.clear()
+
+    def compact(self) -> int:
+        """Delete expired files, then least-recently-played ones until under quota."""
+        now = time.time()
+        total = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return 0
+
+        # Group each audio file with its metadata sidecar so both go together
+        groups = {}
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            total += stat.st_size
+            if name.endswith(".tmp"):
+                continue
+            audio_name = name[:-len(METADATA_SUFFIX)] if name.endswith(METADATA_SUFFIX) else name
+            group = groups.setdefault(audio_name, {"mtime": 0.0, "size": 0, "paths": []})
+            group["size"] += stat.st_size
+            group["paths"].append(path)
+            if audio_name == name:
+                group["mtime"] = stat.st_mtime
+
+        with self._lock:
+            active = self._active_path
+
+        candidates = sorted(
+            (group["mtime"], group["size"], os.path.join(self.cache_dir, audio_name), group["paths"])
+            for audio_name, group in groups.items()
+            if audio_name not in self.pinned
+        )
+        reclaimed = 0
+        evicted = 0
+        for mtime, size, path, paths in candidates:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and total - reclaimed <= self.max_bytes:
+                break
+            if path == active:
+                continue
+            try:
+                for member in sorted(paths, key=len):
+                    os.remove(member)
+            except OSError:
+                continue
+            reclaimed += size
+            evicted += 1
+
+        with self._lock:
+            self._approx_bytes = total - reclaimed
+            self.bytes_reclaimed += reclaimed
+            self.files_evicted += evicted
+            self.last_compaction = now
+
+        if evicted:
+            print(f"[INFO] TTS cache compaction removed {evicted} files ({reclaimed} bytes).")
+        return reclaimed
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "bytes": self._approx_bytes,
+                "max_bytes": self.max_bytes,
+                "pinned": len(self.pinned) - 1,
+                "files_evicted": self.files_evicted,
+                "bytes_reclaimed": self.bytes_reclaimed,
+                "last_compaction": self.last_compaction,
+            }
+
+
+# ----------------- Main Runner -----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the kiosk text-to-speech audio cache.")
+    parser.add_argument("command", choices=["prime", "status", "compact"])
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH)
+    parser.add_argument("--engine", default="gtts", choices=["gtts", "offline", "null", "auto"])
+    parser.add_argument("--max-bytes", type=int, default=int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024))))
+    parser.add_argument("--max-age-days", type=float, default=float(os.getenv("TTS_CACHE_MAX_AGE_DAYS", "30")))
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        manager = TTSCacheManager(args.cache_dir or default_cache_dir(), args.max_bytes, args.max_age_days)
+        manager.compact()
+        print(f"[INFO] TTS cache stats: {manager.stats()}")
+        return 0
+
+    report = prime_audio_bank(args.cache_dir, args.catalog, synthesize=(args.command == "prime"), engine=args.engine)
+    return 1 if report["uncached"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
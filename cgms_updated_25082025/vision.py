@@ -0,0 +1,482 @@
+import os
+import time
+from collections import deque
+
+import cv2
+
+# Fractions of the frame where a face must sit to trigger a conversation: x 30-70%, y 20-80%
+DETECTION_ZONE = (0.3, 0.7, 0.2, 0.8)
+MIN_FACE_SIZE = (160, 160)
+MAX_FACE_SIZE = (250, 250)
+
+# Smallest face (px) we still ask the cascade to find after downscaling; its own window is 24 px
+MIN_SCALED_FACE = 48
+
+
+def detection_zone(width, height, zone=DETECTION_ZONE):
+    """Pixel box (x_start, y_start, x_end, y_end) of the detection zone."""
+    x0, x1, y0, y1 = zone
+    return int(width * x0), int(height * y0), int(width * x1), int(height * y1)
+
+
+def pyramid_levels(min_size, max_levels=3, min_scaled=MIN_SCALED_FACE) -> int:
+    """How many pyrDown halvings keep the smallest wanted face above `min_scaled` px."""
+    levels = 0
+    while levels < max_levels and min(min_size) / (2 ** (levels + 1)) >= min_scaled:
+        levels += 1
+    return levels
+
+
+# ----------------- Zone Detection -----------------
+def detect_faces_in_zone(cascade, frame, zone_box, min_size=MIN_FACE_SIZE, max_size=MAX_FACE_SIZE,
+                         levels=None, scale_factor=1.1, min_neighbors=4, is_gray=False):
+    """
+    Run the Haar cascade only on the detection-zone crop, downscaled by a
+    pyramid, and return faces fully inside the zone in full-frame coordinates.
+
+    With minSize=160 px the cascade never needs full resolution: one pyrDown
+    level quarters the pixels it scans, and cropping to the zone removes
+    another ~75% of the frame.
+    """
+    x_start, y_start, x_end, y_end = zone_box
+    crop = frame[y_start:y_end, x_start:x_end]
+    if crop.size == 0:
+        return []
+
+    gray = crop if is_gray else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+
+    if levels is None:
+        levels = pyramid_levels(min_size)
+    for _ in range(levels):
+        gray = cv2.pyrDown(gray)
+    factor = 2 ** levels
+
+    faces = cascade.detectMultiScale(
+        gray,
+        scaleFactor=scale_factor,
+        minNeighbors=min_neighbors,
+        minSize=(min_size[0] // factor, min_size[1] // factor),
+        maxSize=(max_size[0] // factor, max_size[1] // factor),
+    )
+
+    in_zone = []
+    for (x, y, w, h) in faces:
+        # Map back to full-frame coordinates
+        fx, fy, fw, fh = x_start + x * factor, y_start + y * factor, w * factor, h * factor
+        # Same containment rule as before: face completely within the detection zone
+        if fx >= x_start and fx + fw <= x_end and fy >= y_start and fy + fh <= y_end:
+            in_zone.append((fx, fy, fw, fh))
+    return in_zone
+
+
+# ----------------- Detect-then-Track -----------------
+def _stage_summary(samples) -> dict:
+    if not samples:
+        return {"count": 0, "mean_ms": 0.0, "p95_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+    }
+
+
+class FaceTracker:
+    """
+    Runs the (expensive) detector every `detect_every` frames and follows the
+    face in between with normalized template matching on a small, downscaled
+    search window. A match below `min_confidence` counts as lost and forces a
+    fresh detection on the same frame.
+
+    When `frame_budget_ms` is set, the detection interval stretches while the
+    detector overruns the budget and relaxes back once it fits again.
+    """
+
+    def __init__(self, detect_fn, detect_every=5, min_confidence=0.6, search_margin=0.5,
+                 frame_budget_ms=None, max_detect_every=30, history=240):
+        # detect_fn(frame, zone_box) -> list of (x, y, w, h) in full-frame coordinates
+        self.detect_fn = detect_fn
+        self.base_detect_every = max(1, detect_every)
+        self.detect_every = self.base_detect_every
+        self.max_detect_every = max(self.base_detect_every, max_detect_every)
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self.frame_budget_ms = frame_budget_ms
+
+        self.box = None
+        self.confidence = 0.0
+        self._template = None
+        self._frames_since_detect = 0
+
+        self._detect_ms = deque(maxlen=history)
+        self._track_ms = deque(maxlen=history)
+        self.detections = 0
+        self.tracked_frames = 0
+        self.track_losses = 0
+
+    def reset(self):
+        self.box = None
+        self._template = None
+        self._frames_since_detect = 0
+
+    def update(self, frame, zone_box) -> list:
+        """Return the faces in the zone for this frame (at most the one being tracked)."""
+        if self.box is not None and self._frames_since_detect < self.detect_every:
+            started = time.perf_counter()
+            tracked = self._track(frame, zone_box)
+            self._track_ms.append((time.perf_counter() - started) * 1000.0)
+            if tracked:
+                self._frames_since_detect += 1
+                self.tracked_frames += 1
+                return [self.box]
+            self.track_losses += 1
+
+        return self._detect(frame, zone_box)
+
+    def _detect(self, frame, zone_box):
+        started = time.perf_counter()
+        faces = self.detect_fn(frame, zone_box)
+        elapsed = (time.perf_counter() - started) * 1000.0
+        self._detect_ms.append(elapsed)
+        self.detections += 1
+        self._frames_since_detect = 0
+        self._adapt_interval(elapsed)
+
+        if not len(faces):
+            self.reset()
+            return []
+
+        # Follow the largest face
+        self.box = tuple(int(v) for v in max(faces, key=lambda f: f[2] * f[3]))
+        self.confidence = 1.0
+        self._template = self._small_gray(frame, self.box)
+        return [tuple(int(v) for v in f) for f in faces]
+
+    def _adapt_interval(self, detect_ms):
+        if not self.frame_budget_ms:
+            return
+        if detect_ms > self.frame_budget_ms and self.detect_every < self.max_detect_every:
+            self.detect_every += 1
+        elif detect_ms < self.frame_budget_ms / 2 and self.detect_every > self.base_detect_every:
+            self.detect_every -= 1
+
+    @staticmethod
+    def _small_gray(frame, box):
+        x, y, w, h = box
+        patch = frame[y:y + h, x:x + w]
+        if patch.size == 0:
+            return None
+        if patch.ndim == 3:
+            patch = cv2.cvtColor(patch, cv2.COLOR_BGR2GRAY)
+        return cv2.pyrDown(patch)
+
+    def _track(self, frame, zone_box) -> bool:
+        if self._template is None:
+            return False
+
+        x, y, w, h = self.box
+        height, width = frame.shape[:2]
+        mx, my = int(w * self.search_margin), int(h * self.search_margin)
+        sx0, sy0 = max(0, x - mx), max(0, y - my)
+        sx1, sy1 = min(width, x + w + mx), min(height, y + h + my)
+
+        region = frame[sy0:sy1, sx0:sx1]
+        if region.ndim == 3:
+            region = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+        region = cv2.pyrDown(region)
+
+        th, tw = self._template.shape[:2]
+        if region.shape[0] < th or region.shape[1] < tw:
+            return False
+
+        scores = cv2.matchTemplate(region, self._template, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (bx, by) = cv2.minMaxLoc(scores)
+        self.confidence = float(best)
+        if best < self.min_confidence:
+            return False
+
+        new_box = (sx0 + bx * 2, sy0 + by * 2, w, h)
+        x_start, y_start, x_end, y_end = zone_box
+        nx, ny, nw, nh = new_box
+        # A face that drifts out of the zone no longer counts, same as the detector's rule
+        if not (nx >= x_start and nx + nw <= x_end and ny >= y_start and ny + nh <= y_end):
+            return False
+
+        self.box = new_box
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "detect": _stage_summary(self._detect_ms),
+            "track": _stage_summary(self._track_ms),
+            "detect_every": self.detect_every,
+            "detections": self.detections,
+            "tracked_frames": self.tracked_frames,
+            "track_losses": self.track_losses,
+            "confidence": round(self.confidence, 3),
+        }
+
+
+# ----------------- Capture Scheduling -----------------
+class CaptureScheduler:
+    """
+    Paces the camera loop by kiosk state instead of a fixed sleep:
+
+        idle          nobody near, low frame rate
+        active        motion or a face was seen in the last `active_hold` seconds
+        conversation  detection is paused, only a minimal preview rate
+
+    `wait()` sleeps until the next frame slot. Slots the loop could not keep up
+    with are counted as dropped frames. Measured FPS and process CPU are
+    logged every `report_interval` seconds.
+    """
+
+    IDLE, ACTIVE, CONVERSATION = "idle", "active", "conversation"
+
+    def __init__(self, idle_fps=5.0, active_fps=25.0, conversation_fps=2.0, active_hold=3.0, report_interval=60.0):
+        self.rates = {self.IDLE: idle_fps, self.ACTIVE: active_fps, self.CONVERSATION: conversation_fps}
+        self.active_hold = active_hold
+        self.report_interval = report_interval
+
+        self._conversation = False
+        self._last_activity = 0.0
+        self._last_tick = None
+        self._last_state = self.IDLE
+
+        self.frames = 0
+        self.dropped = 0
+        self.transitions = 0
+        self._window_start = time.time()
+        self._window_cpu = time.process_time()
+        self._window_frames = 0
+        self._window_dropped = 0
+        self.measured_fps = 0.0
+        self.cpu_percent = 0.0
+
+    def set_conversation(self, active: bool):
+        self._conversation = bool(active)
+
+    def notify_activity(self):
+        """Motion or a face in the zone: burst to the active rate."""
+        self._last_activity = time.time()
+
+    @property
+    def state(self) -> str:
+        if self._conversation:
+            return self.CONVERSATION
+        if time.time() - self._last_activity < self.active_hold:
+            return self.ACTIVE
+        return self.IDLE
+
+    @property
+    def target_fps(self) -> float:
+        return self.rates[self.state]
+
+    def wait(self):
+        """Sleep until the next frame slot for the current state."""
+        state = self.state
+        if state != self._last_state:
+            self.transitions += 1
+            self._last_state = state
+
+        interval = 1.0 / max(0.1, self.rates[state])
+        now = time.time()
+        if self._last_tick is not None:
+            deadline = self._last_tick + interval
+            if now < deadline:
+                time.sleep(deadline - now)
+                now = deadline
+            else:
+                # the frame took longer than its slot: count the slots we missed
+                missed = int((now - deadline) / interval)
+                self.dropped += missed
+                self._window_dropped += missed
+        self._last_tick = now
+
+        self.frames += 1
+        self._window_frames += 1
+        self._maybe_report(now)
+
+    def _maybe_report(self, now):
+        elapsed = now - self._window_start
+        if elapsed < self.report_interval:
+            return
+        cpu = time.process_time()
+        self.measured_fps = self._window_frames / elapsed
+        self.cpu_percent = 100.0 * (cpu - self._window_cpu) / elapsed
+        print(f"[INFO] Camera: state={self._last_state} fps={self.measured_fps:.1f} "
+              f"cpu={self.cpu_percent:.1f}% dropped={self._window_dropped}")
+        self._window_start = now
+        self._window_cpu = cpu
+        self._window_frames = 0
+        self._window_dropped = 0
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "target_fps": self.target_fps,
+            "measured_fps": round(self.measured_fps, 1),
+            "cpu_percent": round(self.cpu_percent, 1),
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "transitions": self.transitions,
+        }
+
+
+# ----------------- Motion Gate -----------------
+class MotionGate:
+    """
+    Cheap pre-filter in front of the face detector. The detection zone is
+    shrunk to a tiny grayscale thumbnail and compared against a running-average
+    background. The detector only runs when the fraction of changed pixels
+    reaches `min_area`, or when `refresh_seconds` have passed without a
+    detection, so someone standing perfectly still is still found.
+    """
+
+    def __init__(self, pixel_threshold=18, min_area=0.02, size=(64, 48), learning_rate=0.05, refresh_seconds=2.0):
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.size = size
+        self.learning_rate = learning_rate
+        self.refresh_seconds = refresh_seconds
+
+        self._background = None
+        self._last_pass = 0.0
+        self.energy = 0.0
+
+        self.frames = 0
+        self.passed = 0
+        self.forced = 0
+        self.skipped = 0
+
+    def reset(self):
+        self._background = None
+
+    def motion_energy(self, frame, zone_box) -> float:
+        """Fraction of thumbnail pixels that differ from the background."""
+        x_start, y_start, x_end, y_end = zone_box
+        crop = frame[y_start:y_end, x_start:x_end]
+        if crop.size == 0:
+            return 0.0
+        small = cv2.resize(crop, self.size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+        if self._background is None or self._background.shape != small.shape:
+            self._background = small.astype("float32")
+            # first frame after a reset: treat as motion so the detector gets a look
+            return 1.0
+
+        diff = cv2.absdiff(small, cv2.convertScaleAbs(self._background))
+        _, changed = cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)
+        cv2.accumulateWeighted(small, self._background, self.learning_rate)
+        return cv2.countNonZero(changed) / float(changed.size)
+
+    def check(self, frame, zone_box) -> bool:
+        """True when the detector should run on this frame."""
+        self.frames += 1
+        now = time.time()
+        self.energy = self.motion_energy(frame, zone_box)
+        if self.energy >= self.min_area:
+            self.passed += 1
+            self._last_pass = now
+            return True
+        if now - self._last_pass >= self.refresh_seconds:
+            self.forced += 1
+            self._last_pass = now
+            return True
+        self.skipped += 1
+        return False
+
+    @property
+    def moving(self) -> bool:
+        return self.energy >= self.min_area
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "passed": self.passed,
+            "forced": self.forced,
+            "skipped": self.skipped,
+            "skip_ratio": round(self.skipped / self.frames, 3) if self.frames else 0.0,
+            "energy": round(self.energy, 4),
+        }
+
+
+# ----------------- Configuration -----------------
+def face_tracker_from_env(detect_fn) -> FaceTracker:
+    """Full detector every FACE_DETECT_EVERY frames; template tracking in between."""
+    frame_budget = os.getenv("FACE_FRAME_BUDGET_MS")
+    return FaceTracker(
+        detect_fn,
+        detect_every=int(os.getenv("FACE_DETECT_EVERY", "5")),
+        min_confidence=float(os.getenv("FACE_TRACK_MIN_CONFIDENCE", "0.6")),
+        frame_budget_ms=float(frame_budget) if frame_budget else None,
+    )
+
+
+def capture_scheduler_from_env() -> CaptureScheduler:
+    """Frame rate follows kiosk state: idle / active burst / conversation preview."""
+    return CaptureScheduler(
+        idle_fps=float(os.getenv("CAMERA_IDLE_FPS", "5")),
+        active_fps=float(os.getenv("CAMERA_ACTIVE_FPS", "25")),
+        conversation_fps=float(os.getenv("CAMERA_CONVERSATION_FPS", "2")),
+        active_hold=float(os.getenv("CAMERA_ACTIVE_HOLD", "3")),
+        report_interval=float(os.getenv("CAMERA_STATS_INTERVAL", "60")),
+    )
+
+
+def motion_gate_from_env():
+    """MotionGate from MOTION_* settings, or None when MOTION_GATE=0."""
+    if os.getenv("MOTION_GATE", "1") == "0":
+        return None
+    return MotionGate(
+        pixel_threshold=int(os.getenv("MOTION_PIXEL_THRESHOLD", "18")),
+        min_area=float(os.getenv("MOTION_MIN_AREA", "0.02")),
+        refresh_seconds=float(os.getenv("MOTION_REFRESH_SECONDS", "2")),
+    )
+
+
+class ZoneWatcher:
+    """
+    One detection step for the kiosk: the motion gate, then the detector or
+    tracker, then the activity hint for the capture scheduler. It is shared by
+    the in-process detection thread and the detection worker process.
+    """
+
+    def __init__(self, detect_fn, scheduler=None):
+        self.tracker = face_tracker_from_env(detect_fn)
+        self.motion_gate = motion_gate_from_env()
+        self.scheduler = scheduler
+
+    def faces(self, frame) -> list:
+        height, width = frame.shape[:2]
+        zone_box = detection_zone(width, height)
+        run_detector = True
+        if self.motion_gate is not None:
+            run_detector = self.motion_gate.check(frame, zone_box)
+            if self.motion_gate.moving and self.scheduler is not None:
+                self.scheduler.notify_activity()
+
+        # Detector (on the downscaled zone crop) or tracker; faces come back in full-frame coordinates
+        # A face already being tracked is followed even when it stands still
+        if run_detector or self.tracker.box is not None:
+            faces = self.tracker.update(frame, zone_box)
+        else:
+            faces = []
+        if faces and self.scheduler is not None:
+            self.scheduler.notify_activity()
+        return faces
+
+    def pause(self):
+        """Start each idle period with a fresh detection and background."""
+        if self.tracker.box is not None:
+            self.tracker.reset()
+            if self.motion_gate is not None:
+                self.motion_gate.reset()
+
+    def stats(self) -> dict:
+        return {
+            "tracker": self.tracker.stats(),
+            "motion_gate": self.motion_gate.stats() if self.motion_gate is not None else None,
+        }
@@ -902,7 +902,7 @@ class HighCourt:
         self.speak_pause = False
         self.conversation_pause = False
         
-        BASE_URL = "http://192.168.1.36:8000/cases"
+        BASE_URL = os.getenv("CASES_BASE_URL", "http://192.168.1.36:8000/cases").rstrip("/")
 
         # Check if the case details are already cached
         if hasattr(self, 'case_cache') and case_id in self.case_cache: